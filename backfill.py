@@ -0,0 +1,258 @@
+"""
+Historical backfill of IndiaBix current-affairs quizzes for a date range.
+
+The range is split into deterministic shards (day ordinal modulo shard count),
+so several processes or GitHub Actions matrix jobs can each take one shard:
+
+    python backfill.py run --start 2024-01-01 --end 2024-12-31 --shard-index 0 --shard-count 4
+    python backfill.py merge
+
+Every shard appends each finished URL to its own checkpoint file under
+BACKFILL_CHECKPOINT_DIR (default .cache/backfill) and skips URLs any checkpoint
+already records, so a crashed or cancelled shard resumes where it stopped.
+BACKFILL_RATE caps page requests per second to IndiaBix across all shards
+together. Backfilled quizzes are saved but not announced; "merge" adds every
+checkpointed quiz to the processed-URL Gist in a single edit so the daily run
+skips them.
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+import requests
+from dotenv import load_dotenv
+
+from url_store import BASE_URL
+
+load_dotenv()
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(".cache", "backfill")
+
+# Checkpoint statuses that are final; anything else is retried on the next run
+DONE = "done"
+EMPTY = "empty"
+MISSING = "missing"
+
+
+def date_range_urls(start: datetime.date, end: datetime.date) -> List[str]:
+    """Quiz URLs for every day from start to end inclusive, oldest first."""
+    return [
+        BASE_URL + datetime.date.fromordinal(o).isoformat()
+        for o in range(start.toordinal(), end.toordinal() + 1)
+    ]
+
+
+def shard_of(url: str, shard_count: int) -> int:
+    """Deterministic shard of a quiz URL: consecutive days go to consecutive shards."""
+    day = datetime.date.fromisoformat(url.rstrip("/").rsplit("/", 1)[-1])
+    return day.toordinal() % shard_count
+
+
+def shard_urls(urls: List[str], shard_index: int, shard_count: int) -> List[str]:
+    return [u for u in urls if shard_of(u, shard_count) == shard_index]
+
+
+class ShardCheckpoint:
+    """Append-only record of the URLs one shard has finished, one JSON object per line."""
+
+    def __init__(self, directory: str, shard_index: int, shard_count: int):
+        """
+        Args:
+            directory: Directory shared by the checkpoint files of all shards
+            shard_index: Index of the shard writing this file
+            shard_count: Total number of shards in the run
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, f"shard-{shard_index:03d}-of-{shard_count:03d}.jsonl")
+        self._lock = threading.Lock()
+
+    def _ends_torn(self) -> bool:
+        """Whether the file ends in a partial line, left by a process killed mid-write."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            # Missing or empty
+            return False
+
+    def record(self, url: str, status: str, **extra) -> None:
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            # Start on a fresh line, so a torn one never swallows this record
+            prefix = "\n" if self._ends_torn() else ""
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(prefix + json.dumps(dict(extra, url=url, status=status)) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def read_checkpoints(directory: str) -> Dict[str, str]:
+    """
+    Reads every shard checkpoint in a directory.
+
+    All files are read regardless of shard count, so a backfill can be resumed
+    with a different number of shards.
+
+    Returns:
+        {url: last recorded status}
+    """
+    statuses = {}
+    for path in sorted(glob.glob(os.path.join(directory, "shard-*.jsonl"))):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from a killed process
+                    continue
+                statuses[entry["url"]] = entry["status"]
+    return statuses
+
+
+def run_shard(start, end, shard_index, shard_count, checkpoint_dir, rate=None):
+    """
+    Scrapes, translates and saves every unfinished quiz of one shard.
+
+    Args:
+        start: First day of the backfill
+        end: Last day of the backfill, inclusive
+        shard_index: Which shard this process takes, 0 <= shard_index < shard_count
+        shard_count: Number of shards the range is split into
+        checkpoint_dir: Directory of the shard checkpoint files
+        rate: Page requests per second to IndiaBix across all shards
+
+    Returns:
+        Number of URLs this run failed on
+    """
+    # Imported here so "merge" never loads the scraping and translation modules
+    import main as scraper
+    from pipeline import PagePipeline, parse_concurrency
+
+    finished = {url for url, status in read_checkpoints(checkpoint_dir).items() if status in (DONE, EMPTY, MISSING)}
+    processed_urls = scraper.get_scraped_urls_from_gist()
+    urls = [
+        u for u in shard_urls(date_range_urls(start, end), shard_index, shard_count)
+        if u not in finished and u not in processed_urls
+    ]
+    print(f"Shard {shard_index + 1}/{shard_count}: {len(urls)} URLs to backfill between {start} and {end}.")
+    if not urls:
+        return 0
+
+    # Every shard takes an equal share of the global request budget
+    rate = rate or 1 / max(scraper.POLITENESS_DELAY, 1e-3)
+    host_delay = shard_count / rate
+    print(f"Politeness: one request every {host_delay:.2f}s from this shard ({rate:.2f}/s across {shard_count} shards).")
+    # Paced in the fetcher rather than the pipeline, so retries of failed requests wait their turn too
+    scraper.clients.fetcher.min_interval = host_delay
+
+    checkpoint = ShardCheckpoint(checkpoint_dir, shard_index, shard_count)
+
+    def fetch_stage(url):
+        try:
+            return scraper.fetch_quiz_page(url)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                print(f"No quiz published at {url}")
+                checkpoint.record(url, MISSING)
+                return None
+            raise
+
+    def parse_stage(url, content):
+        if content is None:
+            return None
+        editions = scraper.parse_editions(url, content)
+        if not editions[0]["questions"]:
+            print(f"No questions found on page: {url}")
+            checkpoint.record(url, EMPTY)
+            return None
+        return scraper.mark_repeated_questions([scraper.mark_unchanged_questions(d) for d in editions])
+
+    def persist_stage(editions):
+        outcomes = scraper.save_editions(editions)
+        failed = [d["slug"] for d, (success, _) in zip(editions, outcomes) if not success]
+        if failed:
+            print(f"Failed to save {', '.join(failed)} to Supabase.")
+            return None
+        return True
+
+    def checkpoint_stage(url, editions, saved):
+        # Historical quizzes are not announced
+        checkpoint.record(url, DONE, slugs=[d["slug"] for d in editions])
+        print(f"Backfilled: {url}")
+
+    pipeline = PagePipeline(
+        fetch=fetch_stage,
+        parse=parse_stage,
+        translate=scraper.translate_editions,
+        persist=persist_stage,
+        notify=checkpoint_stage,
+        concurrency=parse_concurrency(os.getenv("PIPELINE_CONCURRENCY")),
+        host_delay=0,
+    )
+    jobs = pipeline.run(urls)
+
+    failed = [job for job in jobs if job.error]
+    done = sum(1 for job in jobs if job.ok)
+    print(f"Shard {shard_index + 1}/{shard_count} finished: {done} saved, {len(failed)} failed, {len(jobs) - done - len(failed)} without a quiz.")
+    for job in failed:
+        print(f"  {job.url}: {job.error}")
+    scraper.print_store_stats()
+    print(f"HTTP fetches: {scraper.clients.fetcher.stats}")
+    scraper.write_run_report()
+    return len(failed)
+
+
+def merge(checkpoint_dir: str) -> bool:
+    """Adds every URL a shard saved to the processed-URL Gist in one edit."""
+    from clients import clients
+    from url_store import ProcessedUrlStore
+
+    statuses = read_checkpoints(checkpoint_dir)
+    done = sorted(url for url, status in statuses.items() if status == DONE)
+    print(f"Merging {len(done)} backfilled URLs from {checkpoint_dir}...")
+    if not done:
+        return True
+
+    store = ProcessedUrlStore(clients.gh, os.getenv("GIST_ID")).load()
+    store.add_many(done)
+    return store.sync()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--checkpoint-dir", default=os.getenv("BACKFILL_CHECKPOINT_DIR", DEFAULT_CHECKPOINT_DIR))
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="backfill one shard of a date range")
+    run.add_argument("--start", required=True, type=datetime.date.fromisoformat, help="first day, YYYY-MM-DD")
+    run.add_argument("--end", type=datetime.date.fromisoformat, default=datetime.date.today(), help="last day, inclusive (default: today)")
+    run.add_argument("--shard-index", type=int, default=0)
+    run.add_argument("--shard-count", type=int, default=1)
+    run.add_argument("--rate", type=float, default=float(os.getenv("BACKFILL_RATE", "0")) or None,
+                     help="page requests per second to IndiaBix across all shards (default: 1 / POLITENESS_DELAY)")
+
+    sub.add_parser("merge", help="add every backfilled URL to the processed-URL Gist")
+    args = ap.parse_args(argv)
+
+    if args.command == "merge":
+        return 0 if merge(args.checkpoint_dir) else 1
+
+    if not 0 <= args.shard_index < args.shard_count:
+        ap.error("--shard-index must be between 0 and --shard-count - 1")
+    if args.end < args.start:
+        ap.error("--end is before --start")
+    from clients import clients
+    try:
+        failed = run_shard(args.start, args.end, args.shard_index, args.shard_count, args.checkpoint_dir, args.rate)
+    finally:
+        clients.close_stores()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,184 @@
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Google keeps paragraph breaks intact far more reliably than any marker token,
+# so chunks are joined on a blank line and the inputs are flattened to one line each.
+DEFAULT_SEPARATOR = "\n\n"
+# deep_translator rejects payloads over 5000 characters
+DEFAULT_MAX_CHUNK_CHARS = 4500
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Every packed input opens with its position ("§3 "), so after splitting each part
+# is checked to be the one expected rather than a neighbour shifted by a merge and a split.
+# Digits may come back in the target script, which \d and int() both accept.
+_PART_MARKER_RE = re.compile(r"§\s*(\d+)\s*")
+
+
+def _mark(position: int, text: str) -> str:
+    return f"§{position} {text}"
+
+
+class BatchTranslator:
+    """Packs many short strings into a few translator requests and splits the results back."""
+
+    def __init__(
+        self,
+        translate_chunk: Callable[[str], str],
+        translate_one: Callable[[str], str],
+        cache=None,
+        glossary=None,
+        source: str = "en",
+        target: str = "gu",
+        max_chunk_chars: int = DEFAULT_MAX_CHUNK_CHARS,
+        max_workers: int = 5,
+        separator: str = DEFAULT_SEPARATOR,
+    ):
+        """
+        Args:
+            translate_chunk: Uncached translator call used for packed chunks
+            translate_one: Per-string translator call used as the fallback path
+            cache: Optional TranslationCache consulted before and filled after each request
+            glossary: Optional Glossary that resolves strings locally and protects known terms
+            source: Source language code
+            target: Target language code
+            max_chunk_chars: Upper bound on the size of one packed request
+            max_workers: Number of chunks translated concurrently
+            separator: String placed between packed inputs
+        """
+        self.translate_chunk = translate_chunk
+        self.translate_one = translate_one
+        self.cache = cache
+        self.glossary = glossary
+        self.source = source
+        self.target = target
+        self.max_chunk_chars = max_chunk_chars
+        self.max_workers = max_workers
+        self.separator = separator
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.fallbacks = 0
+        self.resolved_locally = 0
+
+    def _count_request(self, n: int = 1) -> None:
+        with self._lock:
+            self.requests += n
+
+    def _pack(self, texts: List[str]) -> List[List[str]]:
+        """Greedily groups texts into chunks whose joined length stays under the limit."""
+        chunks = []
+        current: List[str] = []
+        size = 0
+        for text in texts:
+            extra = len(_mark(len(current) + 1, text)) + (len(self.separator) if current else 0)
+            if current and size + extra > self.max_chunk_chars:
+                chunks.append(current)
+                current, size = [], 0
+                extra = len(_mark(1, text))
+            current.append(text)
+            size += extra
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _split(self, translated: str, expected: int) -> Optional[List[str]]:
+        """
+        Splits a translated chunk back into its parts and strips their markers.
+
+        Returns:
+            The parts in input order, or None unless there are exactly expected
+            parts, each carrying its own marker once and something besides it
+        """
+        parts = [p.strip() for p in re.split(r"\n\s*\n", translated or "")]
+        parts = [p for p in parts if p]
+        if len(parts) != expected:
+            return None
+        unmarked = []
+        for position, part in enumerate(parts, 1):
+            markers = _PART_MARKER_RE.findall(part)
+            if len(markers) != 1 or int(markers[0]) != position:
+                return None
+            text = _PART_MARKER_RE.sub("", part, count=1).strip()
+            if not text:
+                return None
+            unmarked.append(text)
+        return unmarked
+
+    def _translate_chunk(self, chunk: List[str]) -> List[str]:
+        if len(chunk) > 1:
+            try:
+                self._count_request()
+                payload = self.separator.join(_mark(position, text) for position, text in enumerate(chunk, 1))
+                parts = self._split(self.translate_chunk(payload), len(chunk))
+                if parts is not None:
+                    return parts
+                logger.warning(f"Batch of {len(chunk)} strings did not split cleanly; falling back to per-string")
+            except Exception as e:
+                logger.warning(f"Batch of {len(chunk)} strings failed ({e}); falling back to per-string")
+            with self._lock:
+                self.fallbacks += 1
+
+        results = []
+        for text in chunk:
+            self._count_request()
+            results.append(self.translate_one(text))
+        return results
+
+    def translate_all(self, texts: List[str]) -> List[str]:
+        """
+        Translate a list of strings, preserving order and empty entries.
+
+        Returns:
+            A list of translations aligned one-to-one with the inputs
+        """
+        flattened = [_WHITESPACE_RE.sub(" ", t or "").strip() for t in texts]
+
+        translations = {}
+        pending = []
+        seen = set()
+        for text in flattened:
+            if not text or text in seen:
+                continue
+            seen.add(text)
+            if self.glossary is not None:
+                resolved = self.glossary.resolve(text, self.target)
+                if resolved is not None:
+                    translations[text] = resolved
+                    self.resolved_locally += 1
+                    continue
+            cached = self.cache.get(text, self.source, self.target) if self.cache is not None else None
+            if cached is not None:
+                translations[text] = cached
+            else:
+                pending.append(text)
+
+        # Known terms travel as [n] markers so only the surrounding words are translated
+        masked = {}
+        if self.glossary is not None:
+            for text in pending:
+                m = self.glossary.mask(text, self.target)
+                if m is not None:
+                    masked[text] = m
+        outgoing = [masked[t][0] if t in masked else t for t in pending]
+
+        chunks = self._pack(outgoing)
+        if chunks:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                chunk_results = list(executor.map(self._translate_chunk, chunks))
+            results = [r for chunk_result in chunk_results for r in chunk_result]
+            for text, result in zip(pending, results):
+                if text in masked:
+                    restored = self.glossary.restore(result, masked[text])
+                    if restored is None:
+                        self._count_request()
+                        restored = self.translate_one(text)
+                    result = restored
+                translations[text] = result
+                if self.cache is not None:
+                    self.cache.set(text, self.source, self.target, result)
+
+        return [translations.get(text, "") for text in flattened]
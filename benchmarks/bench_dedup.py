@@ -0,0 +1,81 @@
+"""
+Measure duplicate-index lookups as the number of indexed questions grows.
+
+    python benchmarks/bench_dedup.py                      # 1k, 10k and 50k questions
+    python benchmarks/bench_dedup.py --sizes 1000 20000 --lookups 200
+
+Questions are synthetic. Half of the lookups are light rewordings of indexed
+questions and half are new. Each size is compared with a linear scan over
+every stored signature.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from duplicate_index import DuplicateIndex, minhash, normalize_question, similarity  # noqa: E402
+
+# Current-affairs questions share a handful of stock words and differ in names and facts
+STOCK = "which of the following is the first india launched scheme award national state minister".split()
+_rng = random.Random(0)
+NAMES = ["".join(_rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(_rng.randint(4, 9))) for _ in range(5000)]
+WORDS = STOCK * 50 + NAMES
+
+
+def make_question(rng):
+    return {"text": " ".join(rng.choice(WORDS) for _ in range(14)) + "?",
+            "options": {k: " ".join(rng.choice(WORDS) for _ in range(2)) for k in "ABCD"}}
+
+
+def reword(question, rng):
+    words = question["text"].split()
+    words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return dict(question, text=" ".join(words))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    ap.add_argument("--lookups", type=int, default=100)
+    args = ap.parse_args()
+
+    rng = random.Random(1)
+    workdir = tempfile.mkdtemp(prefix="bench-dedup-")
+    index = DuplicateIndex(os.path.join(workdir, "duplicates.sqlite"))
+    questions, signatures = [], []
+
+    print(f"{'questions':>10} {'lookup ms':>10} {'scan ms':>9} {'found':>6} {'expected':>9}")
+    for size in sorted(args.sizes):
+        while len(questions) < size:
+            q = make_question(rng)
+            sig = minhash(normalize_question(q))
+            index.add(f"https://example.com/{len(questions) // 10}", "2025-01-01", len(questions) % 10 + 1, str(len(questions)), sig)
+            questions.append(q)
+            signatures.append(sig)
+
+        probes = []
+        for i in range(args.lookups):
+            if i % 2:
+                probes.append(minhash(normalize_question(reword(rng.choice(questions), rng))))
+            else:
+                probes.append(minhash(normalize_question(make_question(rng))))
+
+        started = time.perf_counter()
+        found = sum(1 for sig in probes if index.lookup(sig, "-", "2025-02-01"))
+        lookup_ms = (time.perf_counter() - started) * 1000 / len(probes)
+
+        started = time.perf_counter()
+        for sig in probes[:10]:
+            max(similarity(sig, other) for other in signatures)
+        scan_ms = (time.perf_counter() - started) * 1000 / 10
+
+        print(f"{size:>10} {lookup_ms:>10.2f} {scan_ms:>9.1f} {found:>6} {args.lookups // 2:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Offline end-to-end benchmark of main.py.
+
+Every external service is replaced by a local stand-in from benchmarks/stubs.py:
+IndiaBix by a fixture HTTP server, the translation providers by
+translation_backends.FakeProvider with configurable latency and error rate
+(plus an optional backup provider for hedging and failover), Supabase by an in-memory store (or a local
+Postgres with --database-url), the Gist by an in-memory fake and OneSignal /
+Telegram by a stub HTTP server.
+
+    python benchmarks/bench_e2e.py --pages 20 --latency 0.05 --error-rate 0.02
+    python benchmarks/bench_e2e.py --corpus benchmarks/corpus --output results.json
+    python benchmarks/bench_e2e.py --error-rate 0.2 --backup-latency 0.08
+
+Two scenarios run in order: "main" drives main.main() over every page, then
+"scrape" calls scrape_quiz_page() page by page with a cold translation cache.
+"""
+import argparse
+import datetime
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(name, elapsed, latencies, router, pages):
+    requests = sum(p.requests for p in router.providers)
+    strings = sum(p.strings for p in router.providers)
+    return {
+        "scenario": name,
+        "pages": pages,
+        "elapsed_s": round(elapsed, 3),
+        "pages_per_min": round(pages / elapsed * 60, 2) if elapsed else 0.0,
+        "translator_requests": requests,
+        "translator_errors": sum(p.errors for p in router.providers),
+        "translations_per_s": round(strings / elapsed, 2) if elapsed else 0.0,
+        "page_latency_p50_s": round(percentile(latencies, 50), 3),
+        "page_latency_p95_s": round(percentile(latencies, 95), 3),
+        "providers": router.stats,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--corpus", help="directory of recorded quiz pages named <YYYY-MM-DD>.html (default: synthetic pages)")
+    ap.add_argument("--pages", type=int, default=20, help="number of synthetic pages")
+    ap.add_argument("--questions", type=int, default=10, help="questions per synthetic page")
+    ap.add_argument("--latency", type=float, default=0.05, help="fake translator seconds per request")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fake translator failure probability")
+    ap.add_argument("--tail-rate", type=float, default=0.0, help="fraction of fake translator requests that are slow")
+    ap.add_argument("--tail-latency", type=float, default=1.0, help="extra seconds a slow request takes")
+    ap.add_argument("--backup-latency", type=float, default=0.0,
+                    help="add a second fake provider with this latency to take hedged and failed-over requests")
+    ap.add_argument("--page-latency", type=float, default=0.02, help="fixture server seconds per quiz page")
+    ap.add_argument("--db-latency", type=float, default=0.01, help="in-memory Supabase seconds per call")
+    ap.add_argument("--database-url", help="use a local Postgres with supabase_schema.sql applied instead of the in-memory store")
+    ap.add_argument("--politeness", type=float, default=0.0, help="POLITENESS_DELAY for the run")
+    ap.add_argument("--languages", default="gu", help="TARGET_LANGUAGES for the run, e.g. gu,hi,mr")
+    ap.add_argument("--scenario", choices=["main", "scrape", "all"], default="all")
+    ap.add_argument("--output", help="JSON results file (default: benchmarks/results/e2e-<timestamp>.json)")
+    args = ap.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-e2e-")
+    os.environ.update({
+        "GIST_ID": "bench",
+        "POLITENESS_DELAY": str(args.politeness),
+        "TARGET_LANGUAGES": args.languages,
+        "TRANSLATION_CACHE_PATH": os.path.join(workdir, "translations.sqlite"),
+        "DUPLICATE_INDEX_PATH": os.path.join(workdir, "duplicates.sqlite"),
+        "HTTP_CACHE_DIR": os.path.join(workdir, "http"),
+        "PROCESSED_URLS_JOURNAL": os.path.join(workdir, "processed_urls.journal"),
+        "NOTIFICATION_OUTBOX_PATH": os.path.join(workdir, "outbox.json"),
+        "CARRY_OVER_PATH": os.path.join(workdir, "carry_over.json"),
+        "METRICS_DIR": os.path.join(workdir, "metrics"),
+        "STATIC_DIR": os.path.join(workdir, "static"),
+        "SINK_DIR": os.path.join(workdir, "quizzes"),
+    })
+    for var in ("ONESIGNAL_APP_ID", "ONESIGNAL_REST_API_KEY", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"):
+        os.environ.pop(var, None)
+
+    import main as scraper
+    from notifications import NotificationOutbox, NotificationSender, TelegramSender
+    from translation_cache import TranslationCache
+    from translation_backends import FakeProvider, TranslationRouter
+    from sinks import SupabaseSink
+    from stubs import (FakeGithub, FixtureServer, HostRewriteAdapter,
+                       InMemorySupabase, PostgresSupabase, StubNotificationServer)
+
+    if args.corpus:
+        site = FixtureServer.from_corpus(args.corpus, page_latency=args.page_latency)
+    else:
+        site = FixtureServer.synthetic(args.pages, args.questions, page_latency=args.page_latency)
+    if not site.pages:
+        sys.exit("No pages to serve.")
+    notify_stub = StubNotificationServer()
+
+    # Swap the stand-ins in for the shared clients before anything creates the real ones
+    clients = scraper.clients
+    retries = clients.fetcher.session.get_adapter("https://www.indiabix.com").max_retries
+    clients.fetcher.session.mount("https://", HostRewriteAdapter("www.indiabix.com", site.base_url, max_retries=retries))
+    clients.supabase = PostgresSupabase(args.database_url) if args.database_url else InMemorySupabase(latency=args.db_latency)
+    clients.sink = SupabaseSink(clients.supabase)
+    clients.gh = FakeGithub()
+    clients.notifier = NotificationSender("bench", "bench", api_url=notify_stub.base_url + "/api/v1/notifications")
+    clients.telegram_notifier = TelegramSender("bench", "bench", api_url=notify_stub.base_url)
+    clients.notification_outbox = NotificationOutbox(
+        [clients.notifier, clients.telegram_notifier], path=os.environ["NOTIFICATION_OUTBOX_PATH"]
+    )
+
+    def make_router():
+        providers = [FakeProvider(
+            "fake", latency=args.latency, error_rate=args.error_rate,
+            tail_rate=args.tail_rate, tail_latency=args.tail_latency,
+        )]
+        if args.backup_latency:
+            providers.append(FakeProvider("fake-backup", latency=args.backup_latency, seed=1))
+        return TranslationRouter(providers)
+
+    # Page latency runs from fetch start to a completed save
+    started = {}
+    latencies = []
+    fetch, save = scraper.fetch_quiz_page, scraper.save_editions
+
+    def timed_fetch(url):
+        started[url] = time.perf_counter()
+        return fetch(url)
+
+    def timed_save(editions):
+        result = save(editions)
+        latencies.append(time.perf_counter() - started[editions[0]["source_url"]])
+        return result
+
+    scraper.fetch_quiz_page, scraper.save_editions = timed_fetch, timed_save
+
+    results = []
+    pages = len(site.pages)
+    if args.scenario in ("main", "all"):
+        clients.translation_router = make_router()
+        t0 = time.perf_counter()
+        scraper.main()
+        results.append(summarize("main", time.perf_counter() - t0, latencies, clients.translation_router, pages))
+
+    if args.scenario in ("scrape", "all"):
+        clients.translation_router = make_router()
+        clients.translation_cache = TranslationCache(path=os.path.join(workdir, "scrape.sqlite"))
+        scrape_latencies = []
+        t0 = time.perf_counter()
+        for date_iso in sorted(site.pages):
+            t = time.perf_counter()
+            scraper.scrape_quiz_page(f"https://www.indiabix.com/current-affairs/{date_iso}")
+            scrape_latencies.append(time.perf_counter() - t)
+        results.append(summarize("scrape", time.perf_counter() - t0, scrape_latencies, clients.translation_router, pages))
+
+    report = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "fixture_requests": site.requests,
+        "notifications_received": len(notify_stub.received),
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results", f"e2e-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print()
+    print(f"{'scenario':<9}{'pages/min':>11}{'trans/s':>10}{'p50 s':>8}{'p95 s':>8}{'requests':>10}")
+    for r in results:
+        print(f"{r['scenario']:<9}{r['pages_per_min']:>11}{r['translations_per_s']:>10}"
+              f"{r['page_latency_p50_s']:>8}{r['page_latency_p95_s']:>8}{r['translator_requests']:>10}")
+    print(f"Peak RSS: {report['peak_rss_kb']} KB. Results written to {output}")
+
+    site.close()
+    notify_stub.close()
+
+
+if __name__ == "__main__":
+    main()
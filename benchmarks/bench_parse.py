@@ -0,0 +1,134 @@
+"""
+Compare the BeautifulSoup and lxml quiz-page extractors on a corpus of saved pages.
+
+    python benchmarks/bench_parse.py --record 30      # save the latest 30 quiz pages
+    python benchmarks/bench_parse.py --repeat 5       # time both parsers
+
+Each parser runs in its own subprocess so peak RSS is measured independently.
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "corpus")
+
+
+def legacy_extract(content):
+    from bs4 import BeautifulSoup
+    import main
+
+    soup = BeautifulSoup(content, "html.parser")
+    containers = soup.find_all("div", class_="bix-div-container")
+    return [main.extract_question(idx, c) for idx, c in enumerate(containers)]
+
+
+def fast_extract(content):
+    import fast_parser
+
+    return fast_parser.extract_questions(content)
+
+
+PARSERS = {"bs4": legacy_extract, "lxml": fast_extract}
+
+
+def load_corpus(corpus_dir):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.html"))):
+        with open(path, "rb") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def record(corpus_dir, count):
+    from clients import clients
+    from discovery import listing_urls
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    urls = listing_urls(clients.fetcher)[-count:]
+    for url in urls:
+        name = url.rstrip("/").rsplit("/", 1)[-1] + ".html"
+        with open(os.path.join(corpus_dir, name), "wb") as f:
+            f.write(clients.fetcher.get(url, use_cache=False).content)
+        print(f"Saved {name}")
+        time.sleep(1)
+
+
+def run_one(parser, corpus_dir, repeat):
+    """Runs a single parser over the corpus and prints its measurements as JSON."""
+    extract = PARSERS[parser]
+    pages = load_corpus(corpus_dir)
+    extract(pages[0][1])  # warm up imports and compiled expressions
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for _, content in pages:
+            extract(content)
+    elapsed = time.perf_counter() - started
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    runs = len(pages) * repeat
+    print(json.dumps({
+        "parser": parser,
+        "pages": runs,
+        "total_s": round(elapsed, 4),
+        "ms_per_page": round(elapsed * 1000 / runs, 3),
+        "python_peak_kb": py_peak // 1024,
+        # ru_maxrss is KiB on Linux; includes libxml2 allocations tracemalloc cannot see
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--corpus", default=DEFAULT_CORPUS, help="directory of saved quiz pages (*.html)")
+    ap.add_argument("--repeat", type=int, default=3, help="passes over the corpus per parser")
+    ap.add_argument("--record", type=int, metavar="N", help="download the latest N quiz pages into the corpus and exit")
+    ap.add_argument("--parser", choices=sorted(PARSERS), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.record:
+        record(args.corpus, args.record)
+        return
+    if args.parser:
+        run_one(args.parser, args.corpus, args.repeat)
+        return
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        sys.exit(f"No *.html pages in {args.corpus}; run with --record N first.")
+
+    mismatches = [name for name, content in pages if legacy_extract(content) != fast_extract(content)]
+    print(f"Corpus: {len(pages)} pages, output mismatches: {len(mismatches)}")
+    for name in mismatches:
+        print(f"  MISMATCH {name}")
+
+    results = {}
+    for parser in PARSERS:
+        out = subprocess.run(
+            [sys.executable, __file__, "--parser", parser, "--corpus", args.corpus, "--repeat", str(args.repeat)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results[parser] = json.loads(out.strip().splitlines()[-1])
+
+    print(f"{'parser':<8}{'ms/page':>10}{'total s':>10}{'py peak KB':>12}{'max RSS KB':>12}")
+    for r in results.values():
+        print(f"{r['parser']:<8}{r['ms_per_page']:>10}{r['total_s']:>10}{r['python_peak_kb']:>12}{r['max_rss_kb']:>12}")
+    speedup = results["bs4"]["ms_per_page"] / max(results["lxml"]["ms_per_page"], 1e-9)
+    print(f"lxml speedup: {speedup:.1f}x")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
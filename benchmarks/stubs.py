@@ -0,0 +1,374 @@
+"""
+Local stand-ins for every external service main.py talks to, used by the offline benchmarks.
+Translation is faked by translation_backends.FakeProvider.
+
+- FixtureServer: serves a listing page and quiz pages (recorded or synthetic) over HTTP
+- HostRewriteAdapter: routes www.indiabix.com requests of a requests.Session to the fixture server
+- InMemorySupabase / PostgresSupabase: the subset of the supabase client main.py uses
+- FakeGithub: a single in-memory Gist
+- StubNotificationServer: accepts OneSignal and Telegram API calls
+"""
+import datetime
+import glob
+import http.server
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit, urlunsplit
+
+from requests.adapters import HTTPAdapter
+
+
+# --- IndiaBix ---------------------------------------------------------------
+
+def synthetic_quiz_page(date_iso, n_questions=10, seed=0):
+    """Builds a quiz page with the same markup the scraper expects."""
+    rng = random.Random(f"{date_iso}-{seed}")
+    words = ["India", "ISRO", "launched", "mission", "ministry", "scheme", "2024", "award",
+             "Narendra Modi", "summit", "bank", "policy", "first", "state", "river", "record"]
+    blocks = []
+    for i in range(n_questions):
+        question = " ".join(rng.choice(words) for _ in range(12))
+        options = "".join(
+            f'<div class="bix-opt-row"><div class="bix-td-option"><span class="option-svg option-svg-letter-{l}"></span></div>'
+            f'<div class="bix-td-option-val"><div>{" ".join(rng.choice(words) for _ in range(2))}</div></div></div>'
+            for l in "abcd"
+        )
+        explanation = " ".join(rng.choice(words) for _ in range(30))
+        blocks.append(
+            f'<div class="bix-div-container"><div class="bix-td-qtxt"><p>{i + 1}. {question}?</p></div>{options}'
+            f'<input type="hidden" class="jq-hdnakq" value="{rng.choice("ABCD")}">'
+            f'<div class="bix-div-answer"><div class="bix-ans-description">{explanation}.</div>'
+            f'<div class="explain-link"><a href="/current-affairs/category/">General Knowledge</a></div></div></div>'
+        )
+    return (
+        "<html><head><meta charset='utf-8'><title>Current Affairs</title></head><body>"
+        + "<nav>" + "<a href='#'>menu</a>" * 50 + "</nav>"
+        + "".join(blocks)
+        + "<footer>" + "<p>footer</p>" * 50 + "</footer></body></html>"
+    ).encode("utf-8")
+
+
+def listing_page(dates):
+    links = "".join(f'<a class="text-link" href="/current-affairs/{d}/">{d}</a>' for d in dates)
+    return f"<html><body><div class='card-style'>{links}</div></body></html>".encode("utf-8")
+
+
+class FixtureServer:
+    """Serves /current-affairs/questions-and-answers/ and /current-affairs/<date> from memory."""
+
+    def __init__(self, pages, page_latency=0.0):
+        """
+        Args:
+            pages: {date_iso: page bytes}
+            page_latency: Seconds to sleep before answering each quiz page
+        """
+        self.pages = pages
+        self.page_latency = page_latency
+        self.requests = 0
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests += 1
+                path = self.path.rstrip("/")
+                etag = None
+                if path.endswith("/questions-and-answers"):
+                    body = listing_page(sorted(server.pages))
+                    etag = '"listing-%d"' % len(server.pages)
+                else:
+                    match = re.search(r"/current-affairs/(\d{4}-\d{2}-\d{2})$", path)
+                    body = server.pages.get(match.group(1)) if match else None
+                    if body is None:
+                        self.send_response(404)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    time.sleep(server.page_latency)
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @classmethod
+    def from_corpus(cls, corpus_dir, **kwargs):
+        pages = {}
+        for path in sorted(glob.glob(os.path.join(corpus_dir, "*.html"))):
+            match = re.search(r"(\d{4}-\d{2}-\d{2})", os.path.basename(path))
+            if match:
+                with open(path, "rb") as f:
+                    pages[match.group(1)] = f.read()
+        return cls(pages, **kwargs)
+
+    @classmethod
+    def synthetic(cls, n_pages, n_questions=10, start=datetime.date(2025, 1, 1), **kwargs):
+        dates = [(start + datetime.timedelta(days=i)).isoformat() for i in range(n_pages)]
+        return cls({d: synthetic_quiz_page(d, n_questions) for d in dates}, **kwargs)
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+class HostRewriteAdapter(HTTPAdapter):
+    """Sends requests for one host to a local server, leaving everything else in the session intact."""
+
+    def __init__(self, host, target_base, **kwargs):
+        super().__init__(**kwargs)
+        self.host = host
+        self.target = urlsplit(target_base)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        if parts.netloc == self.host:
+            request.url = urlunsplit((self.target.scheme, self.target.netloc, parts.path, parts.query, parts.fragment))
+        return super().send(request, **kwargs)
+
+
+# --- Supabase ---------------------------------------------------------------
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+def _parse_columns(spec):
+    """Parses "a, b, child(c, d)" into (["a", "b"], {"child": ["c", "d"]})."""
+    columns, embeds = [], {}
+    for match in re.finditer(r"(\w+)\s*(?:\(([^)]*)\))?", spec):
+        name, inner = match.group(1), match.group(2)
+        if inner is not None:
+            embeds[name] = [c.strip() for c in inner.split(",") if c.strip()]
+        else:
+            columns.append(name)
+    return columns, embeds
+
+
+class _Query:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.columns = "*"
+        self.filters = []
+        self.order_by = None
+        self.window = None
+
+    def select(self, columns="*"):
+        self.columns = columns
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, "eq", value))
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, "in", list(values)))
+        return self
+
+    def order(self, column):
+        self.order_by = column
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end)
+        return self
+
+    def execute(self):
+        self.client.calls += 1
+        return _Result(self.client.select(self.table, self.columns, self.filters, self.order_by, self.window))
+
+
+class _Rpc:
+    def __init__(self, client, name, params):
+        self.client, self.name, self.params = client, name, params
+
+    def execute(self):
+        self.client.calls += 1
+        return _Result(getattr(self.client, f"rpc_{self.name}")(**self.params))
+
+
+class InMemorySupabase:
+    """Implements table().select().eq()/in_().order().range().execute() and rpc('upsert_quizzes') over dicts."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.quizzes = {}  # slug -> row
+        self.questions = {}  # quiz id -> {q_index: row}
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def rpc(self, name, params):
+        return _Rpc(self, name, params)
+
+    def select(self, table, spec, filters, order_by=None, window=None):
+        time.sleep(self.latency)
+        columns, embeds = _parse_columns(spec)
+        with self._lock:
+            source = list(self.quizzes.values()) if table == "quizzes" else [
+                q for rows in self.questions.values() for q in rows.values()
+            ]
+            rows = [
+                r for r in source
+                if all(r.get(c) == v if op == "eq" else r.get(c) in v for c, op, v in filters)
+            ]
+            if order_by:
+                rows.sort(key=lambda r: r.get(order_by))
+            if window:
+                rows = rows[window[0]:window[1] + 1]
+            out = []
+            for r in rows:
+                item = {c: r.get(c) for c in columns} if columns != ["*"] else dict(r)
+                for child, child_cols in embeds.items():
+                    children = self.questions.get(r["id"], {}).values() if child == "questions" else []
+                    item[child] = [{c: q.get(c) for c in child_cols} for q in children]
+                out.append(item)
+            return out
+
+    def rpc_upsert_quizzes(self, payload):
+        time.sleep(self.latency)
+        result = []
+        with self._lock:
+            for quiz in payload:
+                quiz = json.loads(json.dumps(quiz))
+                questions = quiz.pop("questions")
+                keep = set(quiz.pop("q_indexes", None) or [q["q_index"] for q in questions])
+                existing = self.quizzes.get(quiz["slug"])
+                inserted = existing is None
+                row = existing or {"id": str(uuid.uuid4())}
+                row.update(quiz)
+                self.quizzes[quiz["slug"]] = row
+                stored = self.questions.setdefault(row["id"], {})
+                for q in questions:
+                    stored[q["q_index"]] = dict(q, quiz_id=row["id"])
+                for idx in [i for i in stored if i not in keep]:
+                    del stored[idx]
+                result.append({"slug": quiz["slug"], "id": row["id"], "inserted": inserted})
+        return result
+
+
+class PostgresSupabase(InMemorySupabase):
+    """Same interface, backed by a real Postgres that has supabase_schema.sql applied."""
+
+    def __init__(self, dsn):
+        import psycopg
+
+        super().__init__()
+        self.conn = psycopg.connect(dsn, autocommit=True)
+        self._lock = threading.Lock()
+
+    def select(self, table, spec, filters, order_by=None, window=None):
+        columns, embeds = _parse_columns(spec)
+        if table != "quizzes" or list(embeds) not in ([], ["questions"]):
+            raise NotImplementedError(f"select on {table} with {spec!r}")
+        where = " and ".join(f"z.{c} = %s" if op == "eq" else f"z.{c} = any(%s)" for c, op, _ in filters) or "true"
+        cols = [f"z.{c}" for c in columns]
+        if "questions" in embeds:
+            inner = ", ".join(f"'{c}', q.{c}" for c in embeds["questions"])
+            cols.append(
+                f"coalesce((select jsonb_agg(jsonb_build_object({inner})) from public.questions q"
+                f" where q.quiz_id = z.id), '[]'::jsonb) as questions"
+            )
+        sql = f"select {', '.join(cols)} from public.quizzes z where {where}"
+        if order_by:
+            sql += f" order by z.{order_by}"
+        if window:
+            sql += f" offset {int(window[0])} limit {int(window[1]) - int(window[0]) + 1}"
+        with self._lock, self.conn.cursor() as cur:
+            cur.execute(sql, [v for _, _, v in filters])
+            names = [d.name for d in cur.description]
+            return [dict(zip(names, row)) for row in cur.fetchall()]
+
+    def rpc_upsert_quizzes(self, payload):
+        with self._lock, self.conn.cursor() as cur:
+            cur.execute("select slug, id::text, inserted from public.upsert_quizzes(%s::jsonb)", (json.dumps(payload),))
+            return [{"slug": s, "id": i, "inserted": ins} for s, i, ins in cur.fetchall()]
+
+
+# --- GitHub Gist ------------------------------------------------------------
+
+class _GistFile:
+    def __init__(self, content):
+        self.content = content
+
+
+class _Gist:
+    def __init__(self, owner):
+        self.owner = owner
+        self.files = {name: _GistFile(c) for name, c in owner.files.items()}
+
+    def edit(self, description=None, files=None):
+        time.sleep(self.owner.latency)
+        self.owner.edits += 1
+        for name, content in (files or {}).items():
+            # PyGithub's InputFileContent exposes its payload through _identity
+            identity = getattr(content, "_identity", None)
+            self.owner.files[name] = identity["content"] if identity else content
+
+
+class FakeGithub:
+    def __init__(self, initial_urls=None, latency=0.0):
+        self.files = {"scraped_urls.json": json.dumps(initial_urls or [])}
+        self.latency = latency
+        self.reads = 0
+        self.edits = 0
+
+    def get_gist(self, gist_id):
+        time.sleep(self.latency)
+        self.reads += 1
+        return _Gist(self)
+
+
+# --- Notifications ----------------------------------------------------------
+
+class StubNotificationServer:
+    """Answers OneSignal /notifications and Telegram /bot<token>/sendMessage with 200."""
+
+    def __init__(self):
+        self.received = []
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                server.received.append((self.path, self.rfile.read(length)))
+                body = json.dumps({"ok": True, "recipients": 1}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
@@ -0,0 +1,149 @@
+"""
+Service clients and local stores shared by the entry points, each created the first time it is used.
+
+Importing this module needs no credentials, opens no files and does not load
+the supabase, PyGithub or deep_translator packages, so a run that finds
+nothing new never pays for them. Assigning an attribute replaces a client,
+e.g. with a stub.
+"""
+import os
+import threading
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "supabase" writes through the upsert RPC; "jsonl" streams shards to SINK_DIR as a dry run
+SINK = os.getenv("SINK", "supabase").lower()
+# Translation providers in order of preference; later ones take hedged and failed-over requests.
+# MyMemory's anonymous tier has a small daily quota, so it is opt-in ("google,mymemory").
+TRANSLATION_PROVIDERS = os.getenv("TRANSLATION_PROVIDERS", "google")
+
+
+class lazy:
+    """Attribute built by its method on first access, once per instance even across threads."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+        self._lock = threading.Lock()
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        with self._lock:
+            # Once stored in the instance dict, later lookups never reach this descriptor
+            if self.name not in obj.__dict__:
+                obj.__dict__[self.name] = self.factory(obj)
+        return obj.__dict__[self.name]
+
+
+class Clients:
+    """Supabase, GitHub, HTTP, notification and translation clients of a run, plus its SQLite stores and glossary."""
+
+    def __init__(self, supabase_url: Optional[str] = None, supabase_key: Optional[str] = None, gh_token: Optional[str] = None):
+        """
+        Args:
+            supabase_url: Defaults to SUPABASE_URL
+            supabase_key: Defaults to SUPABASE_KEY
+            gh_token: Defaults to GH_TOKEN, then GITHUB_TOKEN
+        """
+        self.supabase_url = supabase_url or os.getenv("SUPABASE_URL")
+        self.supabase_key = supabase_key or os.getenv("SUPABASE_KEY")
+        self.gh_token = gh_token or os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN")
+
+    def created(self, name: str) -> bool:
+        """Whether a client has been built (or assigned) already."""
+        return name in self.__dict__
+
+    def close_stores(self) -> None:
+        """
+        Checkpoints and closes the SQLite stores created so far; the next use reopens them.
+
+        The workflows cache only the .sqlite files, so anything still in a
+        write-ahead log at exit would be lost.
+        """
+        for name in ("translation_cache", "duplicate_index"):
+            store = self.__dict__.pop(name, None)
+            if store is not None:
+                store.close()
+
+    @property
+    def writes_production(self) -> bool:
+        """Whether quizzes go to Supabase, answered without building the sink and its client."""
+        if self.created("sink"):
+            return self.sink.writes_production
+        return SINK == "supabase"
+
+    @lazy
+    def supabase(self):
+        if not self.supabase_url or not self.supabase_key:
+            raise RuntimeError("SUPABASE_URL and SUPABASE_KEY must be set")
+        from supabase import create_client
+        return create_client(self.supabase_url, self.supabase_key)
+
+    @lazy
+    def gh(self):
+        from github import Auth, Github
+        return Github(auth=Auth.Token(self.gh_token)) if self.gh_token else Github()
+
+    @lazy
+    def fetcher(self):
+        """Pooled session with retries and a conditional-GET cache for IndiaBix."""
+        from http_client import HttpFetcher
+        return HttpFetcher()
+
+    @lazy
+    def sink(self):
+        """Where scraped quizzes go, chosen by SINK."""
+        from sinks import make_sink
+        return make_sink(SINK, self.supabase if SINK == "supabase" else None)
+
+    @lazy
+    def notifier(self):
+        from notifications import NotificationSender
+        return NotificationSender()
+
+    @lazy
+    def telegram_notifier(self):
+        from notifications import TelegramSender
+        return TelegramSender()
+
+    @lazy
+    def notification_outbox(self):
+        """Quizzes published in a run go out as one digest per channel at the end."""
+        from notifications import NotificationOutbox
+        return NotificationOutbox([self.notifier, self.telegram_notifier])
+
+    @lazy
+    def translation_router(self):
+        """Picks a healthy provider per call, hedging slow calls and failing over on errors."""
+        from translation_backends import TranslationRouter, build_providers
+        return TranslationRouter(
+            build_providers(TRANSLATION_PROVIDERS),
+            hedge_percentile=float(os.getenv("TRANSLATION_HEDGE_PERCENTILE", "95")),
+        )
+
+    @lazy
+    def translation_cache(self):
+        """Persistent translation cache shared by all translator threads."""
+        from translation_cache import TranslationCache
+        return TranslationCache()
+
+    @lazy
+    def glossary(self):
+        """Curated term renderings plus number/acronym passthrough, applied before the cache and translator."""
+        from glossary import Glossary
+        return Glossary.load()
+
+    @lazy
+    def duplicate_index(self):
+        """MinHash/LSH index of past questions; exact repeats reuse the translations they were published with."""
+        from duplicate_index import DuplicateIndex
+        return DuplicateIndex()
+
+
+# Shared by main.py, mark_all_processed.py and the tools that import main
+clients = Clients()
@@ -0,0 +1,21 @@
+import hashlib
+import json
+from typing import Iterable
+
+
+def question_hash(question: dict) -> str:
+    """Hashes the English source of a question (text, options, answer, explanation, category)."""
+    source = {
+        "text": question.get("text", ""),
+        "options": question.get("options", {}),
+        "answer": question.get("answer", ""),
+        "explanation": question.get("explanation", ""),
+        "category": question.get("category", ""),
+    }
+    canonical = json.dumps(source, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def page_hash(question_hashes: Iterable[str]) -> str:
+    """Hashes the ordered question hashes of a page, so any edit, addition or reorder changes it."""
+    return hashlib.sha256("\n".join(question_hashes).encode("utf-8")).hexdigest()
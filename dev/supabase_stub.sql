@@ -0,0 +1,28 @@
+-- Minimal stand-ins for the Supabase pieces supabase_schema.sql relies on,
+-- so the schema can be applied to a plain local Postgres.
+
+do $$
+begin
+    if not exists (select 1 from pg_roles where rolname = 'anon') then
+        create role anon nologin;
+    end if;
+    if not exists (select 1 from pg_roles where rolname = 'authenticated') then
+        create role authenticated nologin;
+    end if;
+    if not exists (select 1 from pg_roles where rolname = 'service_role') then
+        create role service_role nologin bypassrls;
+    end if;
+end $$;
+
+create schema if not exists auth;
+
+create table if not exists auth.users (
+    id uuid primary key,
+    raw_user_meta_data jsonb
+);
+
+create or replace function auth.role() returns text
+language sql stable as $$ select coalesce(current_setting('request.jwt.claim.role', true), 'anon') $$;
+
+create or replace function auth.uid() returns uuid
+language sql stable as $$ select nullif(current_setting('request.jwt.claim.sub', true), '')::uuid $$;
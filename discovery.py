@@ -0,0 +1,53 @@
+import re
+from typing import Container, List
+
+LISTING_URL = "https://www.indiabix.com/current-affairs/questions-and-answers/"
+
+_QUIZ_URL_RE = re.compile(r"/current-affairs/\d{4}-\d{2}-\d{2}$")
+
+
+def extract_listing_urls(content) -> List[str]:
+    """Dated quiz URLs linked from the cards of the listing page, absolute and sorted."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+
+    urls = []
+    for card in soup.find_all("div", class_="card-style"):
+        for link in card.find_all("a", class_="text-link"):
+            href = link.get("href")
+            if not href:
+                continue
+            if not href.startswith("http"):
+                if href.startswith("/"):
+                    href = "https://www.indiabix.com" + href
+                else:
+                    href = "https://www.indiabix.com/current-affairs/" + href
+            href = href.rstrip("/")
+            if _QUIZ_URL_RE.search(href):
+                urls.append(href)
+
+    return sorted(set(urls))
+
+
+def listing_urls(fetcher) -> List[str]:
+    """
+    Every quiz URL on the listing page.
+
+    An unchanged listing (304) reuses the links extracted last time, so it is
+    neither downloaded nor parsed again.
+
+    Args:
+        fetcher: HttpFetcher whose conditional-GET cache holds the listing
+    """
+    result = fetcher.get(LISTING_URL)
+    urls = fetcher.get_extracted(LISTING_URL) if result.not_modified else None
+    if urls is None:
+        urls = extract_listing_urls(result.content)
+        fetcher.set_extracted(LISTING_URL, urls)
+    return urls
+
+
+def new_quiz_urls(fetcher, processed_urls: Container[str]) -> List[str]:
+    """Listing URLs not in processed_urls (a ProcessedUrlStore or any container)."""
+    return [url for url in listing_urls(fetcher) if url not in processed_urls]
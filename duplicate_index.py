@@ -0,0 +1,310 @@
+import array
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join(".cache", "duplicates.sqlite")
+# 10 bands of 6 rows: pairs at 0.8 Jaccard become candidates 95% of the time, pairs at 0.5 only 15%
+BANDS = 10
+ROWS = 6
+NUM_PERM = BANDS * ROWS
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240805)
+# Fixed permutations, so signatures stored by one run compare with the next
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+_NUMBERING_RE = re.compile(r"^\s*(?:q(?:uestion)?\s*)?\d+\s*[.)]\s*", re.I)
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+TRANSLATED_FIELDS = ("text", "options", "explanation")
+
+
+def normalize_question(question: dict) -> str:
+    """Lower-cased question text and option values without numbering, punctuation or extra spaces."""
+    text = _NUMBERING_RE.sub("", question.get("text") or "")
+    options = " ".join(sorted((question.get("options") or {}).values()))
+    return _NON_WORD_RE.sub(" ", f"{text} {options}".lower()).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash(text: str) -> List[int]:
+    """MinHash signature of the character shingles of text."""
+    hashed = [zlib.crc32(s.encode("utf-8")) for s in shingles(text)]
+    return [min((a * x + b) % _MERSENNE_PRIME for x in hashed) & 0xFFFFFFFF for a, b in _PERMUTATIONS]
+
+
+def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def band_keys(signature: List[int]) -> List[int]:
+    """One bucket key per band, as signed 64-bit integers for SQLite."""
+    keys = []
+    for band in range(BANDS):
+        rows = array.array("I", signature[band * ROWS:(band + 1) * ROWS]).tobytes()
+        digest = hashlib.blake2b(bytes([band]) + rows, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+class DuplicateMatch:
+    """An earlier question that a new one repeats."""
+
+    def __init__(self, entry_id: int, source_url: str, quiz_date: Optional[str], q_index: int, similarity: float, exact: bool):
+        self.entry_id = entry_id
+        self.source_url = source_url
+        self.quiz_date = quiz_date
+        self.q_index = q_index
+        self.similarity = similarity
+        self.exact = exact
+
+
+class DuplicateIndex:
+    """
+    Persistent MinHash/LSH index of English question text, backed by SQLite.
+
+    Each indexed question keeps its signature, content hash and the translations
+    it was published with. A lookup first tries an exact content-hash match,
+    then fetches candidates from the LSH band buckets (an indexed IN query, never
+    a scan) and keeps those whose estimated similarity reaches the threshold.
+    """
+
+    def __init__(self, path: Optional[str] = None, threshold: Optional[float] = None):
+        """
+        Open (or create) the index database.
+
+        Args:
+            path: SQLite file location, defaults to DUPLICATE_INDEX_PATH or .cache/duplicates.sqlite
+            threshold: Estimated Jaccard similarity from which a question counts as a repeat
+        """
+        self.path = path or os.getenv("DUPLICATE_INDEX_PATH", DEFAULT_INDEX_PATH)
+        self.threshold = threshold if threshold is not None else float(os.getenv("DUPLICATE_THRESHOLD", DEFAULT_THRESHOLD))
+        self.lookups = 0
+        self.near = 0
+        self.exact = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " id INTEGER PRIMARY KEY,"
+            " source_url TEXT NOT NULL,"
+            " q_index INTEGER NOT NULL,"
+            " quiz_date TEXT,"
+            " content_hash TEXT NOT NULL,"
+            " signature BLOB NOT NULL,"
+            " UNIQUE (source_url, q_index));"
+            "CREATE INDEX IF NOT EXISTS entries_content_hash_idx ON entries(content_hash);"
+            "CREATE TABLE IF NOT EXISTS bands (key INTEGER NOT NULL, entry_id INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS bands_key_idx ON bands(key);"
+            "CREATE INDEX IF NOT EXISTS bands_entry_idx ON bands(entry_id);"
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " entry_id INTEGER NOT NULL,"
+            " lang TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " PRIMARY KEY (entry_id, lang));"
+        )
+        self._conn.commit()
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def lookup(self, signature: List[int], content_hash: str, quiz_date: Optional[str]) -> Optional[DuplicateMatch]:
+        """
+        Find the earliest indexed question, from a quiz dated before quiz_date, that this one repeats.
+
+        Pages are scraped newest first and backfills fill in older ranges, so
+        the index can already hold later quizzes; those are never originals.
+
+        Args:
+            quiz_date: ISO date of the page being scraped; an undated page has no originals
+
+        Returns:
+            The match, or None if nothing reaches the threshold
+        """
+        self._count("lookups")
+        if not quiz_date:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, source_url, quiz_date, q_index FROM entries"
+                " WHERE content_hash = ? AND quiz_date < ? ORDER BY quiz_date, id LIMIT 1",
+                (content_hash, quiz_date),
+            ).fetchone()
+            if row:
+                self.exact += 1
+                return DuplicateMatch(*row, similarity=1.0, exact=True)
+
+            keys = band_keys(signature)
+            candidates = self._conn.execute(
+                "SELECT e.id, e.source_url, e.quiz_date, e.q_index, e.signature FROM entries e"
+                f" WHERE e.id IN (SELECT entry_id FROM bands WHERE key IN ({','.join('?' * len(keys))}))"
+                " AND e.quiz_date < ?",
+                (*keys, quiz_date),
+            ).fetchall()
+        matches = []
+        for entry_id, url, quiz_date, q_index, blob in candidates:
+            score = similarity(signature, array.array("I", blob).tolist())
+            if score >= self.threshold:
+                matches.append(DuplicateMatch(entry_id, url, quiz_date, q_index, score, exact=False))
+        if not matches:
+            return None
+        self._count("near")
+        # The first time a question appeared is the original
+        return min(matches, key=lambda m: (m.quiz_date or "", -m.similarity, m.entry_id))
+
+    def translation(self, entry_id: int, lang: str) -> Optional[dict]:
+        """The translated text, options and explanation an indexed question was published with in lang, counted as reused."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM translations WHERE entry_id = ? AND lang = ?", (entry_id, lang)
+            ).fetchone()
+            if row is None:
+                return None
+            self.reused += 1
+        return json.loads(row[0])
+
+    def add(
+        self,
+        source_url: str,
+        quiz_date: Optional[str],
+        q_index: int,
+        content_hash: str,
+        signature: List[int],
+        translations: Optional[Dict[str, dict]] = None,
+    ) -> None:
+        """
+        Index a question, replacing what was stored for the same page and position.
+
+        Args:
+            translations: {lang: {"text", "options", "explanation"}} the question was published with
+        """
+        blob = array.array("I", signature).tobytes()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, content_hash FROM entries WHERE source_url = ? AND q_index = ?", (source_url, q_index)
+            ).fetchone()
+            if row and row[1] == content_hash:
+                entry_id = row[0]
+            else:
+                if row:
+                    # The question was edited; its old signature and translations no longer apply
+                    self._conn.execute("DELETE FROM bands WHERE entry_id = ?", (row[0],))
+                    self._conn.execute("DELETE FROM translations WHERE entry_id = ?", (row[0],))
+                    self._conn.execute(
+                        "UPDATE entries SET quiz_date = ?, content_hash = ?, signature = ? WHERE id = ?",
+                        (quiz_date, content_hash, blob, row[0]),
+                    )
+                    entry_id = row[0]
+                else:
+                    entry_id = self._conn.execute(
+                        "INSERT INTO entries (source_url, q_index, quiz_date, content_hash, signature) VALUES (?, ?, ?, ?, ?)",
+                        (source_url, q_index, quiz_date, content_hash, blob),
+                    ).lastrowid
+                self._conn.executemany(
+                    "INSERT INTO bands (key, entry_id) VALUES (?, ?)", [(key, entry_id) for key in band_keys(signature)]
+                )
+            for lang, fields in (translations or {}).items():
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO translations (entry_id, lang, payload) VALUES (?, ?, ?)",
+                    (entry_id, lang, json.dumps({f: fields[f] for f in TRANSLATED_FIELDS}, ensure_ascii=False)),
+                )
+            self._conn.commit()
+
+    def indexed_pages(self) -> set:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT DISTINCT source_url FROM entries")}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "entries": len(self),
+            "lookups": self.lookups,
+            "exact": self.exact,
+            "near": self.near,
+            "reused": self.reused,
+        }
+
+    def close(self) -> None:
+        """Folds the write-ahead log into the database file and closes it, so the .sqlite file alone is complete."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
+
+
+def main(argv=None) -> int:
+    """Builds the index from quizzes already in Supabase, re-reading their English pages through the HTTP cache."""
+    import argparse
+    import time
+
+    ap = argparse.ArgumentParser(description="Index the questions of quizzes already stored in Supabase.")
+    ap.add_argument("--limit", type=int, default=None, help="stop after this many pages")
+    args = ap.parse_args(argv)
+
+    import main as scraper
+    from static_bundles import fetch_quiz_rows
+
+    columns = "slug, lang, quiz_date, source_url, questions(q_index, text, options, explanation, content_hash)"
+    pages: Dict[str, Dict[str, dict]] = {}
+    for row in fetch_quiz_rows(scraper.clients.supabase, columns=columns):
+        if row.get("source_url"):
+            pages.setdefault(row["source_url"], {})[row.get("lang") or "gu"] = row
+
+    index = scraper.clients.duplicate_index
+    done = index.indexed_pages()
+    todo = [url for url in sorted(pages) if url not in done][:args.limit]
+    print(f"{len(pages)} pages in Supabase, {len(done)} already indexed, indexing {len(todo)}.")
+    for url in todo:
+        try:
+            base = scraper.parse_quiz_page(url, scraper.fetch_quiz_page(url))
+        except Exception as e:
+            print(f"  Skipping {url}: {e}")
+            continue
+        stored = {lang: {q["q_index"]: q for q in row.get("questions") or []} for lang, row in pages[url].items()}
+        for q in base["questions"]:
+            # Only translations of the same English source are reusable
+            translations = {
+                lang: by_index[q["q_index"]]
+                for lang, by_index in stored.items()
+                if by_index.get(q["q_index"], {}).get("content_hash") == q["content_hash"]
+            }
+            index.add(url, base["quiz_date"], q["q_index"], q["content_hash"], minhash(normalize_question(q)), translations)
+        time.sleep(scraper.POLITENESS_DELAY)
+    print(f"Duplicate index: {index.stats}")
+    scraper.clients.close_stores()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
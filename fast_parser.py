@@ -0,0 +1,122 @@
+from typing import List
+
+try:
+    from lxml import etree, html as lxml_html
+    HAS_LXML = True
+except ImportError:  # pragma: no cover - exercised only without lxml installed
+    HAS_LXML = False
+
+
+def _has_class(name: str) -> str:
+    # Same semantics as BeautifulSoup's class_ filter: match one whitespace-separated class
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if HAS_LXML:
+    _CONTAINERS = etree.XPath(f"//div[{_has_class('bix-div-container')}]")
+    _QUESTION_TEXT = etree.XPath(f"(.//div[{_has_class('bix-td-qtxt')}])[1]")
+    _OPTION_ROWS = etree.XPath(f".//div[{_has_class('bix-opt-row')}]")
+    _OPTION_LETTER = etree.XPath(f"(.//div[{_has_class('bix-td-option')}])[1]")
+    _OPTION_VALUE = etree.XPath(f"(.//div[{_has_class('bix-td-option-val')}])[1]")
+    _FIRST_SPAN = etree.XPath("(.//span)[1]")
+    _ANSWER = etree.XPath(f"(.//input[{_has_class('jq-hdnakq')}])[1]")
+    _EXPLANATION = etree.XPath(f"(.//div[{_has_class('bix-ans-description')}])[1]")
+    _CATEGORY = etree.XPath(f"(.//div[{_has_class('explain-link')}])[1]")
+    _FIRST_LINK = etree.XPath("(.//a)[1]")
+    # BeautifulSoup's get_text() skips the contents of these elements
+    _TEXT = etree.XPath(
+        "descendant-or-self::text()"
+        "[not(ancestor::script or ancestor::style or ancestor::template or ancestor::rt or ancestor::rp)]"
+    )
+
+
+def _text(elem) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True)."""
+    return "".join(s.strip() for s in _TEXT(elem))
+
+
+def _first(xpath, elem):
+    found = xpath(elem)
+    return found[0] if found else None
+
+
+def _decode(content) -> str:
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        from bs4.dammit import UnicodeDammit
+        return UnicodeDammit(content, is_html=True).unicode_markup
+
+
+def _extract(idx: int, container) -> dict:
+    q_text_elem = _first(_QUESTION_TEXT, container)
+    q_text_en = _text(q_text_elem) if q_text_elem is not None else ""
+
+    options_en = {}
+    for row in _OPTION_ROWS(container):
+        opt_letter_elem = _first(_OPTION_LETTER, row)
+        opt_val_elem = _first(_OPTION_VALUE, row)
+
+        if opt_letter_elem is not None and opt_val_elem is not None:
+            letter_span = _first(_FIRST_SPAN, opt_letter_elem)
+            letter = ""
+            if letter_span is not None:
+                for c in (letter_span.get("class") or "").split():
+                    if "option-svg-letter-" in c:
+                        letter = c.split("-")[-1].upper()
+                        break
+            if not letter:
+                letter = _text(opt_letter_elem).replace(".", "")
+
+            options_en[letter] = _text(opt_val_elem)
+
+    ans_input = _first(_ANSWER, container)
+    answer = ans_input.get("value") if ans_input is not None else ""
+
+    exp_elem = _first(_EXPLANATION, container)
+    explanation_en = _text(exp_elem) if exp_elem is not None else ""
+
+    category = "General"
+    cat_elem = _first(_CATEGORY, container)
+    if cat_elem is not None:
+        cat_a = _first(_FIRST_LINK, cat_elem)
+        if cat_a is not None:
+            category = _text(cat_a)
+
+    return {
+        "q_index": idx + 1,
+        "text": q_text_en,
+        "options": options_en,
+        "explanation": explanation_en,
+        "answer": answer,
+        "category": category
+    }
+
+
+def extract_questions(content) -> List[dict]:
+    """
+    Extract every question on a quiz page with lxml.
+
+    Walks only the bix-div-container subtrees using XPath expressions compiled
+    once at import, instead of repeated BeautifulSoup find/find_all scans.
+
+    Args:
+        content: Raw page bytes or decoded HTML
+
+    Returns:
+        Untranslated question dicts in page order, same shape as main.extract_question
+    """
+    markup = _decode(content)
+    if not markup.strip():
+        return []
+    root = lxml_html.document_fromstring(markup)
+
+    questions = []
+    for idx, container in enumerate(_CONTAINERS(root)):
+        try:
+            questions.append(_extract(idx, container))
+        except Exception as e:
+            print(f"  Error parsing question {idx+1}: {e}")
+    return questions
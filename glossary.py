@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from locales import MONTHS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GLOSSARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "glossary.json")
+
+# Numbers, years, dates, percentages and amounts read the same in every target language
+_NUMERIC_RE = re.compile(r"^[\s\d.,:;/%()+\-–—₹$€£]*\d[\s\d.,:;/%()+\-–—₹$€£]*$")
+_ACRONYM_TOKEN_RE = re.compile(r"^[A-Z0-9][A-Z0-9&./\-]*$")
+_TOKEN_SPLIT_RE = re.compile(r"[\s,]+")
+# All-caps option values that are still words, e.g. "NONE OF THE ABOVE"
+_WORDS = {"ALL", "AND", "ABOVE", "BOTH", "NONE", "NOT", "OF", "ONLY", "OR", "THE", "THESE", "IN"}
+# Leftover text between glossary terms that needs no translation
+_NEUTRAL_RE = re.compile(r"^[\s\d.,:;/%()+\-–—&'\"₹$€£]*$")
+_MONTH_NAMES = "|".join(MONTHS["en"])
+# "5 August 2024", "August 5, 2024", "August 2024"
+_DATE_RES = (
+    re.compile(rf"^(?P<day>\d{{1,2}})(?:st|nd|rd|th)?\s+(?P<month>{_MONTH_NAMES}),?\s+(?P<year>\d{{4}})$", re.I),
+    re.compile(rf"^(?P<month>{_MONTH_NAMES})\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<year>\d{{4}})$", re.I),
+    re.compile(rf"^(?P<month>{_MONTH_NAMES}),?\s+(?P<year>\d{{4}})$", re.I),
+)
+# Markers standing in for glossary terms inside text sent to the translator
+_MARKER_RE = re.compile(r"\[\s*(\d+)\s*\]")
+
+
+def is_numeric(text: str) -> bool:
+    return bool(_NUMERIC_RE.match(text))
+
+
+def localize_date(text: str, target: str) -> Optional[str]:
+    """Renders an English date like "5 August 2024" with the month name in target, if target has one."""
+    if target not in MONTHS:
+        return None
+    for pattern in _DATE_RES:
+        match = pattern.match(text)
+        if match:
+            month = MONTHS[target][[m.lower() for m in MONTHS["en"]].index(match.group("month").lower())]
+            day = match.groupdict().get("day")
+            return f"{int(day)} {month} {match.group('year')}" if day else f"{month} {match.group('year')}"
+    return None
+
+
+def is_acronym(text: str) -> bool:
+    """True for strings made only of upper-case acronyms and codes, e.g. "ISRO", "G20", "UN/WHO"."""
+    tokens = [t for t in _TOKEN_SPLIT_RE.split(text.strip()) if t]
+    if not tokens:
+        return False
+    for token in tokens:
+        if len(token) < 2 or token in _WORDS or not _ACRONYM_TOKEN_RE.match(token):
+            return False
+        if not any(c.isalpha() for c in token):
+            return False
+    return True
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over lower-cased keys, finding every occurrence of every key in one pass."""
+
+    def __init__(self, keys):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        for key in keys:
+            self._add(key.lower())
+        self._build()
+
+    def _add(self, key: str) -> None:
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(key)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Returns (start, end, key) for every match in text, compared case-insensitively."""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Lower-casing changed offsets (rare non-ASCII input); match as-is
+            lowered = text
+        matches = []
+        node = 0
+        for i, ch in enumerate(lowered):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for key in self._out[node]:
+                matches.append((i - len(key) + 1, i + 1, key))
+        return matches
+
+
+class Glossary:
+    """
+    Curated renderings of names and terms, applied before anything reaches the translator.
+
+    Numeric and acronym-only strings pass through unchanged, English dates get
+    the target language's month name, strings made only of glossary terms are
+    composed from their renderings, and in longer text each term is swapped for
+    a [n] marker so only the remaining words are translated.
+    """
+
+    def __init__(self, terms: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Args:
+            terms: {English term: {language code: rendering}}
+        """
+        self.terms = {term.lower(): renderings for term, renderings in (terms or {}).items()}
+        self._index = AhoCorasick(self.terms)
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.passthrough = 0
+        self.composed = 0
+        self.masked = 0
+        self.restore_failures = 0
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "Glossary":
+        """Loads terms from GLOSSARY_PATH or glossary.json next to this module; empty if the file is missing."""
+        path = path or os.getenv("GLOSSARY_PATH", DEFAULT_GLOSSARY_PATH)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            logger.warning(f"Glossary {path} not found; only numbers and acronyms will skip translation")
+            return cls()
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def _spans(self, text: str, target: str) -> List[Tuple[int, int, str]]:
+        """Leftmost-longest, non-overlapping whole-word matches that have a rendering for target."""
+        candidates = []
+        for start, end, key in self._index.find(text):
+            rendering = self.terms[key].get(target)
+            if not rendering:
+                continue
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end].isalnum():
+                continue
+            candidates.append((start, end, rendering))
+        candidates.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        spans = []
+        last_end = 0
+        for start, end, rendering in candidates:
+            if start >= last_end:
+                spans.append((start, end, rendering))
+                last_end = end
+        return spans
+
+    def resolve(self, text: str, target: str) -> Optional[str]:
+        """
+        Resolve a whole string without the translator.
+
+        Returns:
+            The rendering for target, or None if the string still needs translating
+        """
+        self._count("lookups")
+        text = text.strip()
+        spans = self._spans(text, target)
+        if spans:
+            out = []
+            pos = 0
+            for start, end, rendering in spans:
+                gap = text[pos:start]
+                if not (_NEUTRAL_RE.match(gap) or is_acronym(gap)):
+                    break
+                out.append(gap)
+                out.append(rendering)
+                pos = end
+            else:
+                tail = text[pos:]
+                if _NEUTRAL_RE.match(tail) or is_acronym(tail):
+                    self._count("composed")
+                    return "".join(out) + tail
+        if is_numeric(text) or is_acronym(text):
+            self._count("passthrough")
+            return text
+        date = localize_date(text, target)
+        if date is not None:
+            self._count("composed")
+            return date
+        return None
+
+    def mask(self, text: str, target: str) -> Optional[Tuple[str, List[str]]]:
+        """
+        Swap glossary terms in text for [n] markers.
+
+        Returns:
+            (masked text, renderings by marker number), or None if nothing was masked
+        """
+        if _MARKER_RE.search(text):
+            # The text already contains markers of its own
+            return None
+        spans = self._spans(text, target)
+        if not spans:
+            return None
+        out = []
+        pos = 0
+        for i, (start, end, rendering) in enumerate(spans):
+            out.append(text[pos:start])
+            out.append(f"[{i}]")
+            pos = end
+        out.append(text[pos:])
+        self._count("masked")
+        return "".join(out), [rendering for _, _, rendering in spans]
+
+    def restore(self, translated: str, masked: Tuple[str, List[str]]) -> Optional[str]:
+        """Put the renderings back in place of the markers; None if the translator dropped or duplicated one."""
+        _, renderings = masked
+        found = [int(m.group(1)) for m in _MARKER_RE.finditer(translated or "")]
+        if sorted(found) != list(range(len(renderings))):
+            self._count("restore_failures")
+            return None
+        return _MARKER_RE.sub(lambda m: renderings[int(m.group(1))], translated)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "terms": len(self.terms),
+            "lookups": self.lookups,
+            "passthrough": self.passthrough,
+            "composed": self.composed,
+            "masked": self.masked,
+            "restore_failures": self.restore_failures,
+        }
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "http")
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class PacedRetry(Retry):
+    """Retry that waits for the caller's pacing before every retried request, not just the first one."""
+
+    pace: Optional[Callable[[], None]] = None
+
+    def new(self, **kw) -> "PacedRetry":
+        retry = super().new(**kw)
+        retry.pace = self.pace
+        return retry
+
+    def sleep(self, response=None) -> None:
+        super().sleep(response)
+        if self.pace is not None:
+            self.pace()
+
+
+class FetchResult:
+    """Body and cache status of one GET."""
+
+    def __init__(self, url: str, status: int, content: bytes, not_modified: bool = False):
+        self.url = url
+        self.status = status
+        self.content = content
+        self.not_modified = not_modified
+
+
+class HttpFetcher:
+    """Pooled keep-alive session with retries and an on-disk conditional-GET cache."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        headers: Optional[dict] = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30,
+        pool_size: int = 10,
+        min_interval: float = 0.0,
+    ):
+        """
+        Args:
+            cache_dir: Directory for cached bodies and validators, defaults to HTTP_CACHE_DIR or .cache/http
+            headers: Headers sent with every request
+            retries: Retries for connection errors and 429/5xx responses
+            backoff: Backoff factor between retries
+            timeout: Per-request timeout in seconds
+            pool_size: Keep-alive connections kept per host
+            min_interval: Seconds between any two requests from this fetcher, retries
+                included; 0 leaves pacing to the caller
+        """
+        self.cache_dir = cache_dir or os.getenv("HTTP_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self._next_request = 0.0
+        self._pace_lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        retry = PacedRetry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+        )
+        retry.pace = self._pace
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.cache_hits = 0
+        self.bytes_fetched = 0
+        self.bytes_saved = 0
+
+    def _pace(self) -> None:
+        """Blocks until min_interval has passed since the previous request from any thread."""
+        if self.min_interval <= 0:
+            return
+        with self._pace_lock:
+            delay = self._next_request - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_request = time.monotonic() + self.min_interval
+
+    def _paths(self, url: str):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, digest)
+        return base + ".json", base + ".body"
+
+    def _load_meta(self, url: str) -> dict:
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self, url: str, meta: dict) -> None:
+        meta_path, _ = self._paths(url)
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    def _save_body(self, url: str, content: bytes) -> None:
+        # Renamed into place, so a killed run never leaves a truncated body for a later 304 to serve
+        _, body_path = self._paths(url)
+        tmp = body_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(content)
+        os.replace(tmp, body_path)
+
+    def get(self, url: str, use_cache: bool = True) -> FetchResult:
+        """
+        GET a URL, revalidating against the cached copy when one exists.
+
+        Args:
+            url: Absolute URL to fetch
+            use_cache: Send If-None-Match/If-Modified-Since and store the response
+
+        Returns:
+            FetchResult whose content is the cached body when the server answered 304
+        """
+        meta = self._load_meta(url) if use_cache else {}
+        _, body_path = self._paths(url)
+        headers = {}
+        if meta and os.path.exists(body_path):
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        self._pace()
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        size = len(response.content)
+
+        if response.status_code == 304 and headers:
+            with open(body_path, "rb") as f:
+                content = f.read()
+            with self._lock:
+                self.requests += 1
+                self.cache_hits += 1
+                self.bytes_saved += len(content)
+            return FetchResult(url, 304, content, not_modified=True)
+
+        response.raise_for_status()
+        with self._lock:
+            self.requests += 1
+            self.bytes_fetched += size
+
+        if use_cache and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            self._save_body(url, response.content)
+            self._save_meta(url, {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            })
+        return FetchResult(url, response.status_code, response.content)
+
+    def get_extracted(self, url: str) -> Optional[Any]:
+        """Returns data previously extracted from the cached body of url, if any."""
+        return self._load_meta(url).get("extracted")
+
+    def set_extracted(self, url: str, data: Any) -> None:
+        """Remembers data extracted from the current cached body so a 304 can skip parsing."""
+        meta = self._load_meta(url)
+        if meta:
+            meta["extracted"] = data
+            self._save_meta(url, meta)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "bytes_fetched": self.bytes_fetched,
+            "bytes_saved": self.bytes_saved,
+        }
@@ -0,0 +1,199 @@
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the duration histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Samples kept per histogram for percentile estimates
+RESERVOIR_SIZE = 1024
+
+
+class Histogram:
+    """Cumulative-bucket duration histogram plus a bounded sample reservoir for percentiles."""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.samples: List[float] = []
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(value)
+        else:
+            slot = random.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = value
+
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100)))]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_s": round(self.sum, 4),
+            "mean_s": round(self.sum / self.count, 4) if self.count else 0.0,
+            "p50_s": round(self.percentile(50), 4),
+            "p95_s": round(self.percentile(95), 4),
+            "max_s": round(self.max, 4),
+        }
+
+
+class Metrics:
+    """
+    Run-wide durations, counters and gauges with JSON, Prometheus and job-summary output.
+
+    When disabled, timed() hands back the undecorated function and the record
+    methods return immediately, so instrumented code pays nothing.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, prefix: str = "indiabix_scraper"):
+        """
+        Args:
+            enabled: Defaults to the METRICS_ENABLED environment variable
+            prefix: Prefix for Prometheus metric names
+        """
+        if enabled is None:
+            enabled = os.getenv("METRICS_ENABLED", "0").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        self.prefix = prefix
+        self.started_at = time.time()
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.histograms.setdefault(name, Histogram()).observe(seconds)
+
+    def inc(self, name: str, amount: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[name] = value
+
+    def record_stats(self, group: str, stats: dict) -> None:
+        """Copies the numeric entries of a component's stats dict in as gauges named group_key."""
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.set_gauge(f"{group}_{key}", value)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator recording the duration, calls and errors of every call under name."""
+        def decorator(fn):
+            if not self.enabled:
+                return fn
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                except Exception:
+                    self.inc(f"{name}_errors")
+                    raise
+                finally:
+                    self.observe(name, time.perf_counter() - started)
+                    self.inc(f"{name}_calls")
+            return wrapper
+        return decorator
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "duration_s": round(time.time() - self.started_at, 3),
+                "durations": {name: h.summary() for name, h in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items())),
+                "gauges": dict(sorted(self.gauges.items())),
+            }
+
+    def prometheus(self) -> str:
+        """Renders the metrics in the Prometheus text exposition format (for node_exporter's textfile collector)."""
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_duration_seconds Duration of instrumented calls.",
+            f"# TYPE {p}_duration_seconds histogram",
+        ]
+        with self._lock:
+            for name, h in sorted(self.histograms.items()):
+                for bound, count in zip(BUCKETS, h.counts):
+                    lines.append(f'{p}_duration_seconds_bucket{{fn="{name}",le="{bound}"}} {count}')
+                lines.append(f'{p}_duration_seconds_bucket{{fn="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'{p}_duration_seconds_sum{{fn="{name}"}} {h.sum:.6f}')
+                lines.append(f'{p}_duration_seconds_count{{fn="{name}"}} {h.count}')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {p}_{name}_total counter")
+                lines.append(f"{p}_{name}_total {value}")
+            for name, value in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {p}_{name} gauge")
+                lines.append(f"{p}_{name} {value}")
+        lines.append(f"# TYPE {p}_last_run_timestamp_seconds gauge")
+        lines.append(f"{p}_last_run_timestamp_seconds {self.started_at:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def markdown(self) -> str:
+        report = self.report()
+        lines = [
+            f"### Scraper run report ({report['duration_s']} s)",
+            "",
+            "| Stage | Calls | Total s | Mean s | p95 s | Max s |",
+            "|---|---:|---:|---:|---:|---:|",
+        ]
+        for name, s in report["durations"].items():
+            lines.append(f"| `{name}` | {s['count']} | {s['sum_s']} | {s['mean_s']} | {s['p95_s']} | {s['max_s']} |")
+        counters = {**report["counters"], **report["gauges"]}
+        if counters:
+            lines += ["", "| Metric | Value |", "|---|---:|"]
+            lines += [f"| `{k}` | {v} |" for k, v in counters.items()]
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Optional[str] = None) -> None:
+        """Writes run_report.json and scraper.prom, and appends to the GitHub Actions job summary if available."""
+        if not self.enabled:
+            return
+        directory = directory or os.getenv("METRICS_DIR", "metrics")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "run_report.json"), "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        # Write then rename so the textfile collector never reads a partial file
+        prom_path = os.path.join(directory, "scraper.prom")
+        with open(prom_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(prom_path + ".tmp", prom_path)
+
+        summary_path = os.getenv("GITHUB_STEP_SUMMARY")
+        if summary_path:
+            with open(summary_path, "a", encoding="utf-8") as f:
+                f.write(self.markdown())
+        print(f"Run report written to {directory}/")
+
+
+# Shared by every module of a run
+metrics = Metrics()
@@ -0,0 +1,48 @@
+import datetime
+from typing import Dict, List
+
+# Language whose quizzes keep the original un-suffixed slugs
+DEFAULT_LANGUAGE = "gu"
+
+MONTHS: Dict[str, List[str]] = {
+    "gu": [
+        "જાન્યુઆરી", "ફેબ્રુઆરી", "માર્ચ", "એપ્રિલ", "મે", "જૂન",
+        "જુલાઈ", "ઓગસ્ટ", "સપ્ટેમ્બર", "ઓક્ટોબર", "નવેમ્બર", "ડિસેમ્બર",
+    ],
+    "hi": [
+        "जनवरी", "फ़रवरी", "मार्च", "अप्रैल", "मई", "जून",
+        "जुलाई", "अगस्त", "सितंबर", "अक्टूबर", "नवंबर", "दिसंबर",
+    ],
+    "mr": [
+        "जानेवारी", "फेब्रुवारी", "मार्च", "एप्रिल", "मे", "जून",
+        "जुलै", "ऑगस्ट", "सप्टेंबर", "ऑक्टोबर", "नोव्हेंबर", "डिसेंबर",
+    ],
+    "en": [
+        "January", "February", "March", "April", "May", "June",
+        "July", "August", "September", "October", "November", "December",
+    ],
+}
+
+
+def parse_languages(spec: str) -> List[str]:
+    """Parses "gu,hi,mr" into a de-duplicated list of language codes, keeping the order."""
+    languages = []
+    for part in (spec or "").split(","):
+        lang = part.strip().lower()
+        if lang and lang not in languages:
+            languages.append(lang)
+    return languages or [DEFAULT_LANGUAGE]
+
+
+def format_date(date_iso: str, lang: str) -> str:
+    """Converts 2025-08-05 to "5 <month> 2025" with the month name in lang, English if unknown."""
+    dt = datetime.datetime.strptime(date_iso, "%Y-%m-%d")
+    month = MONTHS.get(lang, MONTHS["en"])[dt.month - 1]
+    return f"{dt.day} {month} {dt.year}"
+
+
+def quiz_slug(date_iso: str, lang: str) -> str:
+    """indiabix-<date> for the default language, indiabix-<date>-<lang> for the others."""
+    if lang == DEFAULT_LANGUAGE:
+        return f"indiabix-{date_iso}"
+    return f"indiabix-{date_iso}-{lang}"
@@ -1,113 +1,100 @@
+import argparse
 import os
-import requests
-from bs4 import BeautifulSoup
-from supabase import create_client, Client
-from deep_translator import GoogleTranslator
-from github import Github, Auth
-from github.InputFileContent import InputFileContent
-import datetime
+import sys
 import time
-import json
 import re
-import random
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor
-from notifications import NotificationSender, TelegramSender
+from clients import clients
+from discovery import new_quiz_urls
+from batch_translator import BatchTranslator
+from scheduler import CarryOver, DeadlineScheduler, RunBudget, newest_first
+from rate_limiter import AdaptiveLimiter
+from duplicate_index import minhash, normalize_question
+import fast_parser
+from url_store import ProcessedUrlStore
+from content_hash import question_hash, page_hash
+from instrumentation import metrics
+from locales import parse_languages, format_date, quiz_slug
 
 load_dotenv()
 
-# Configuration
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-GH_TOKEN = os.getenv("GH_TOKEN")
+# Configuration; credentials are read by clients.py when a client is first needed
 GIST_ID = os.getenv("GIST_ID")
+# "batch" packs a page's strings into a few requests, "single" translates them one by one
+TRANSLATION_MODE = os.getenv("TRANSLATION_MODE", "batch").lower()
+# Per-call retry budget for the translator; a call that exhausts it fails its page
+TRANSLATION_MAX_RETRIES = int(os.getenv("TRANSLATION_MAX_RETRIES", "6"))
+TRANSLATION_DEADLINE = float(os.getenv("TRANSLATION_DEADLINE", "120"))
+# "lxml" walks only the question containers with precompiled XPath, "bs4" builds the full soup
+PARSER = os.getenv("PARSER", "lxml" if fast_parser.HAS_LXML else "bs4").lower()
+# Minimum seconds between two requests to the same host
+POLITENESS_DELAY = float(os.getenv("POLITENESS_DELAY", "1.0"))
+# Every page is parsed once and translated into each of these; notifications go out for the first
+TARGET_LANGUAGES = parse_languages(os.getenv("TARGET_LANGUAGES", "gu"))
+PRIMARY_LANGUAGE = TARGET_LANGUAGES[0]
+# Rebuild static quiz bundles for the quizzes a run changed, optionally uploading them to a Storage bucket
+STATIC_BUNDLES = os.getenv("STATIC_BUNDLES", "0").lower() in ("1", "true", "yes")
+STATIC_BUCKET = os.getenv("STATIC_BUCKET")
+# Wall-clock budget of a run in minutes (unset: no limit); pages that would not finish in time go to the next run
+RUN_BUDGET_MINUTES = float(os.getenv("RUN_BUDGET_MINUTES", "0")) or None
+# Seconds of the budget kept for the Gist sync, notifications and reports at the end
+RUN_BUDGET_MARGIN = float(os.getenv("RUN_BUDGET_MARGIN", "120"))
 
-# Initialize clients
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-auth = Auth.Token(GH_TOKEN)
-gh = Github(auth=auth)
-
-# Initialize Notification Senders
-notifier = NotificationSender()
-telegram_notifier = TelegramSender()
-
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-}
-
-GUJARATI_MONTHS = {
-    1: "જાન્યુઆરી",
-    2: "ફેબ્રુઆરી",
-    3: "માર્ચ",
-    4: "એપ્રિલ",
-    5: "મે",
-    6: "જૂન",
-    7: "જુલાઈ",
-    8: "ઓગસ્ટ",
-    9: "સપ્ટેમ્બર",
-    10: "ઓક્ટોબર",
-    11: "નવેમ્બર",
-    12: "ડિસેમ્બર"
-}
-
-def get_gujarati_date(date_iso):
-    """Converts 2025-08-05 to 5 ઓગસ્ટ 2025"""
+# Supabase, GitHub, the sink, notification senders, translation providers, the
+# translation cache, the glossary and the duplicate index live on the shared
+# `clients` and are only created once a run needs them.
+
+# Unlimited until scrape_new_quizzes() starts the run's own budget, so importing
+# main (backfill, benchmarks, tests) never starts the clock
+run_budget = RunBudget()
+# Unfinished URLs and page-time estimates carry over between runs
+carry_over = CarryOver()
+
+# Run-wide limiter every translator call goes through
+translation_limiter = AdaptiveLimiter(
+    rate=float(os.getenv("TRANSLATION_RATE", "5")),
+    max_rate=float(os.getenv("TRANSLATION_MAX_RATE", "20")),
+    max_concurrency=int(os.getenv("TRANSLATION_MAX_CONCURRENCY", "12")),
+)
+
+def get_localized_date(date_iso, lang):
+    """Converts 2025-08-05 to 5 ઓગસ્ટ 2025 (gu), 5 अगस्त 2025 (hi), ..."""
     try:
-        dt = datetime.datetime.strptime(date_iso, "%Y-%m-%d")
-        day = dt.day
-        month = GUJARATI_MONTHS[dt.month]
-        year = dt.year
-        return f"{day} {month} {year}"
+        return format_date(date_iso, lang)
     except Exception as e:
         print(f"Date conversion error: {e}")
         return date_iso
 
+@metrics.timed("get_scraped_urls_from_gist")
 def get_scraped_urls_from_gist():
-    try:
-        gist = gh.get_gist(GIST_ID)
-        if "scraped_urls.json" in gist.files:
-            content = gist.files["scraped_urls.json"].content
-            return json.loads(content)
-        return []
-    except Exception as e:
-        print(f"Error fetching Gist: {e}")
-        return []
+    """Loads the processed-URL store from the Gist plus any unsynced local journal."""
+    return ProcessedUrlStore(clients.gh, GIST_ID).load()
 
-def update_scraped_urls_in_gist(urls):
-    try:
-        gist = gh.get_gist(GIST_ID)
-        content = json.dumps(urls, indent=2)
-        gist.edit(files={"scraped_urls.json": InputFileContent(content)})
-        print("Gist updated successfully.")
-    except Exception as e:
-        print(f"Error updating Gist: {e}")
+@metrics.timed("update_scraped_urls_in_gist")
+def update_scraped_urls_in_gist(processed_urls):
+    """Writes pending additions to the Gist in a single edit."""
+    return processed_urls.sync()
 
+@metrics.timed("get_new_quiz_urls")
 def get_new_quiz_urls(processed_urls):
-    base_url = "https://www.indiabix.com/current-affairs/questions-and-answers/"
-    response = requests.get(base_url, headers=HEADERS)
-    soup = BeautifulSoup(response.content, "html.parser")
-    
-    new_urls = []
-    card_styles = soup.find_all("div", class_="card-style")
-    for card in card_styles:
-        links = card.find_all("a", class_="text-link")
-        for link in links:
-            href = link.get("href")
-            if href:
-                if not href.startswith("http"):
-                    if href.startswith("/"):
-                        href = "https://www.indiabix.com" + href
-                    else:
-                        href = "https://www.indiabix.com/current-affairs/" + href
-                
-                href = href.rstrip("/")
-                if re.search(r'/current-affairs/\d{4}-\d{2}-\d{2}$', href):
-                    if href not in processed_urls:
-                        new_urls.append(href)
+    return new_quiz_urls(clients.fetcher, processed_urls)
+
+@metrics.timed("translate_uncached")
+def _translate_uncached(text, target='gu'):
+    """Calls the translation providers through the shared limiter, bypassing the cache."""
+    def attempt():
+        return clients.translation_router.translate(text, 'en', target)
     
-    return list(set(new_urls))
+    return translation_limiter.call(
+        attempt,
+        max_retries=TRANSLATION_MAX_RETRIES,
+        timeout=run_budget.cap(TRANSLATION_DEADLINE),
+        label=f"Translation for snippet: {text[:30]}...",
+    )
 
-def translate_safe(text):
+@metrics.timed("translate_safe")
+def translate_safe(text, target='gu'):
     if not text:
         return ""
     
@@ -116,207 +103,511 @@ def translate_safe(text):
     if not text:
         return ""
 
-    wait_time = 1
-    max_wait = 30
-    attempts = 0
-    
-    # Use a local translator instance per call to be thread-safe
-    local_translator = GoogleTranslator(source='en', target='gu')
-    
-    while True:
-        try:
-            result = local_translator.translate(text)
-            if result:
-                return result
-            raise Exception("Empty translation result")
-        except Exception as e:
-            attempts += 1
-            print(f"    [Attempt {attempts}] Translation failed for snippet: {text[:30]}... Error: {e}")
-            jitter = random.uniform(0.5, 1.5)
-            actual_wait = wait_time * jitter
-            print(f"    Waiting {actual_wait:.2f}s before retry...")
-            time.sleep(actual_wait)
-            
-            # Exponential backoff
-            wait_time = min(wait_time * 2, max_wait)
-            
-            # Refresh translator instance after multiple failures
-            if attempts % 5 == 0:
-                local_translator = GoogleTranslator(source='en', target='gu')
+    resolved = clients.glossary.resolve(text, target)
+    if resolved is not None:
+        return resolved
 
-def process_single_question(idx, container):
-    """Processes and translates a single question container."""
-    try:
-        q_text_elem = container.find("div", class_="bix-td-qtxt")
-        q_text_en = q_text_elem.get_text(strip=True) if q_text_elem else ""
-        
-        options_en = {}
-        opt_rows = container.find_all("div", class_="bix-opt-row")
-        for row in opt_rows:
-            opt_letter_elem = row.find("div", class_="bix-td-option")
-            opt_val_elem = row.find("div", class_="bix-td-option-val")
-            
-            if opt_letter_elem and opt_val_elem:
-                letter_span = opt_letter_elem.find("span")
-                letter = ""
-                if letter_span:
-                    classes = letter_span.get("class", [])
-                    for c in classes:
-                        if "option-svg-letter-" in c:
-                            letter = c.split("-")[-1].upper()
-                            break
-                if not letter:
-                    letter = opt_letter_elem.get_text(strip=True).replace(".", "")
-                
-                val_en = opt_val_elem.get_text(strip=True)
-                options_en[letter] = val_en
-        
-        ans_input = container.find("input", class_="jq-hdnakq")
-        answer = ans_input.get("value") if ans_input else ""
-        
-        exp_elem = container.find("div", class_="bix-ans-description")
-        explanation_en = exp_elem.get_text(strip=True) if exp_elem else ""
-        
-        category = "General"
-        cat_elem = container.find("div", class_="explain-link")
-        if cat_elem:
-            cat_a = cat_elem.find("a")
-            if cat_a:
-                category = cat_a.get_text(strip=True)
-        
-        print(f"  Starting translation for question {idx+1}...")
+    cached = clients.translation_cache.get(text, 'en', target)
+    if cached is not None:
+        return cached
+
+    masked = clients.glossary.mask(text, target)
+    result = None
+    if masked is not None:
+        result = clients.glossary.restore(_translate_uncached(masked[0], target), masked)
+    if result is None:
+        result = _translate_uncached(text, target)
+    clients.translation_cache.set(text, 'en', target, result)
+    return result
+
+def extract_question(idx, container):
+    """Pulls the English question, options, answer, explanation and category out of a container."""
+    q_text_elem = container.find("div", class_="bix-td-qtxt")
+    q_text_en = q_text_elem.get_text(strip=True) if q_text_elem else ""
+    
+    options_en = {}
+    opt_rows = container.find_all("div", class_="bix-opt-row")
+    for row in opt_rows:
+        opt_letter_elem = row.find("div", class_="bix-td-option")
+        opt_val_elem = row.find("div", class_="bix-td-option-val")
         
-        text_gu = translate_safe(q_text_en)
-        explanation_gu = translate_safe(explanation_en)
-        options_gu = {k: translate_safe(v) for k, v in options_en.items()}
+        if opt_letter_elem and opt_val_elem:
+            letter_span = opt_letter_elem.find("span")
+            letter = ""
+            if letter_span:
+                classes = letter_span.get("class", [])
+                for c in classes:
+                    if "option-svg-letter-" in c:
+                        letter = c.split("-")[-1].upper()
+                        break
+            if not letter:
+                letter = opt_letter_elem.get_text(strip=True).replace(".", "")
             
-        return {
-            "q_index": idx + 1,
-            "text": text_gu,
-            "options": options_gu,
-            "explanation": explanation_gu,
-            "answer": answer,
-            "category": category
-        }
-    except Exception as e:
-        print(f"  Error parsing question {idx+1}: {e}")
-        return None
+            val_en = opt_val_elem.get_text(strip=True)
+            options_en[letter] = val_en
+    
+    ans_input = container.find("input", class_="jq-hdnakq")
+    answer = ans_input.get("value") if ans_input else ""
+    
+    exp_elem = container.find("div", class_="bix-ans-description")
+    explanation_en = exp_elem.get_text(strip=True) if exp_elem else ""
+    
+    category = "General"
+    cat_elem = container.find("div", class_="explain-link")
+    if cat_elem:
+        cat_a = cat_elem.find("a")
+        if cat_a:
+            category = cat_a.get_text(strip=True)
+    
+    return {
+        "q_index": idx + 1,
+        "text": q_text_en,
+        "options": options_en,
+        "explanation": explanation_en,
+        "answer": answer,
+        "category": category
+    }
 
-def scrape_quiz_page(url):
-    print(f"Scraping: {url}")
-    response = requests.get(url, headers=HEADERS)
-    soup = BeautifulSoup(response.content, "html.parser")
+def translate_questions_batched(questions, target='gu'):
+    """Translates every string of a page through a few packed requests instead of one per string."""
+    texts = []
+    for q in questions:
+        texts.append(q["text"])
+        texts.append(q["explanation"])
+        texts.extend(q["options"].values())
+    
+    translate = lambda text: _translate_uncached(text, target)
+    batcher = BatchTranslator(
+        translate_chunk=translate,
+        translate_one=translate,
+        cache=clients.translation_cache,
+        glossary=clients.glossary,
+        target=target,
+        max_workers=translation_limiter.max_concurrency,
+    )
+    translated = iter(batcher.translate_all(texts))
     
+    for q in questions:
+        q["text"] = next(translated)
+        q["explanation"] = next(translated)
+        q["options"] = {k: next(translated) for k in q["options"]}
+    
+    per_string_requests = sum(1 for t in texts if t and t.strip())
+    metrics.inc("translation_batch_requests", batcher.requests)
+    metrics.inc("translation_per_string_equivalent", per_string_requests)
+    metrics.inc("translation_batch_fallbacks", batcher.fallbacks)
+    metrics.inc("translation_glossary_resolved", batcher.resolved_locally)
+    print(f"  Translation requests for page ({target}): {batcher.requests} (per-string path: {per_string_requests}, batch fallbacks: {batcher.fallbacks}, resolved by glossary: {batcher.resolved_locally})")
+    return questions
+
+@metrics.timed("fetch_quiz_page")
+def fetch_quiz_page(url):
+    print(f"Scraping: {url}")
+    return clients.fetcher.get(url).content
+
+@metrics.timed("parse_quiz_page")
+def parse_quiz_page(url, content, lang=None):
+    """Parses a quiz page into quiz metadata for lang plus untranslated (English) questions."""
+    lang = lang or PRIMARY_LANGUAGE
     date_match = re.search(r'(\d{4}-\d{2}-\d{2})', url)
     date_iso = date_match.group(1) if date_match else None
-    date_gu = get_gujarati_date(date_iso) if date_iso else ""
-    
-    containers = soup.find_all("div", class_="bix-div-container")
     
-    # Process all questions on the page concurrently for speed
-    # Using 5 workers as a balance between speed and reliability
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        results = list(executor.map(lambda i_c: process_single_question(i_c[0], i_c[1]), enumerate(containers)))
+    if PARSER == "lxml":
+        questions = fast_parser.extract_questions(content)
+    else:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(content, "html.parser")
+        containers = soup.find_all("div", class_="bix-div-container")
+        
+        questions = []
+        for idx, container in enumerate(containers):
+            try:
+                questions.append(extract_question(idx, container))
+            except Exception as e:
+                print(f"  Error parsing question {idx+1}: {e}")
     
-    questions = [q for q in results if q is not None]
+    # Hash the English source before translation overwrites it
+    for q in questions:
+        q["content_hash"] = question_hash(q)
             
-    return {
-        "title": f"Current IndiaBix - {date_gu}",
-        "date_str": date_gu,
-        "slug": f"indiabix-{date_iso}",
+    return localize_quiz({
         "quiz_date": date_iso,
         "source_url": url,
+        "page_hash": page_hash(q["content_hash"] for q in questions),
         "questions": questions
-    }
+    }, lang, copy_questions=False)
 
-def save_to_supabase(data):
-    try:
-        quiz_data = {
-            "title": data["title"],
-            "slug": data["slug"],
-            "date_str": data["date_str"],
-            "quiz_date": data["quiz_date"],
-            "source_url": data["source_url"]
+def localize_quiz(quiz_data, lang, copy_questions=True):
+    """Returns the edition of a parsed quiz for lang, with its own slug, date and question dicts."""
+    date_iso = quiz_data["quiz_date"]
+    date_str = get_localized_date(date_iso, lang) if date_iso else ""
+    questions = quiz_data["questions"]
+    if copy_questions:
+        questions = [dict(q, options=dict(q["options"])) for q in questions]
+    return dict(
+        quiz_data,
+        lang=lang,
+        title=f"Current IndiaBix - {date_str}",
+        date_str=date_str,
+        slug=quiz_slug(date_iso, lang),
+        questions=questions,
+    )
+
+def parse_editions(url, content):
+    """Parses a page once and returns one untranslated edition per target language, primary first."""
+    base = parse_quiz_page(url, content, PRIMARY_LANGUAGE)
+    return [base] + [localize_quiz(base, lang) for lang in TARGET_LANGUAGES[1:]]
+
+@metrics.timed("get_existing_hashes")
+def get_existing_hashes(slug):
+    """Returns (page_hash, {q_index: content_hash}) of a stored quiz, or (None, {}) if there is none."""
+    return clients.sink.existing_hashes(slug)
+
+def mark_unchanged_questions(quiz_data):
+    """Flags questions whose English source matches what is already stored, so they are neither translated nor rewritten."""
+    stored_page_hash, stored = get_existing_hashes(quiz_data["slug"])
+    for q in quiz_data["questions"]:
+        q["unchanged"] = stored.get(q["q_index"]) == q["content_hash"]
+    quiz_data["unchanged"] = stored_page_hash is not None and stored_page_hash == quiz_data["page_hash"]
+    
+    changed = sum(1 for q in quiz_data["questions"] if not q["unchanged"])
+    if stored_page_hash is not None:
+        print(f"  {quiz_data['slug']} already stored: {changed} of {len(quiz_data['questions'])} questions changed.")
+    return quiz_data
+
+@metrics.timed("mark_repeated_questions")
+def mark_repeated_questions(editions):
+    """
+    Links questions that repeat one from an earlier page to the original, in every edition.
+    
+    Exact repeats (same content hash) take the translations the original was
+    published with, so they are not translated again.
+    """
+    base = editions[0]
+    for i, q in enumerate(base["questions"]):
+        signature = minhash(normalize_question(q))
+        match = clients.duplicate_index.lookup(signature, q["content_hash"], base["quiz_date"])
+        if match is not None and match.quiz_date:
+            kind = "exact repeat" if match.exact else f"{match.similarity:.0%} similar"
+            print(f"  Question {q['q_index']} repeats {match.source_url} #{match.q_index} ({kind})")
+        for d in editions:
+            dq = d["questions"][i]
+            dq["signature"] = signature
+            if match is None or not match.quiz_date:
+                continue
+            dq["duplicate_of"] = {"slug": quiz_slug(match.quiz_date, d["lang"]), "q_index": match.q_index}
+            if match.exact and not dq.get("unchanged"):
+                stored = clients.duplicate_index.translation(match.entry_id, d["lang"])
+                if stored:
+                    dq.update(stored)
+                    dq["reused"] = True
+    return editions
+
+def index_questions(editions, outcomes):
+    """Adds a page's questions to the duplicate index with the translations that were just saved."""
+    if not clients.writes_production:
+        # A dry run saved nothing, so later runs must not mark repeats of these questions
+        return
+    base = editions[0]
+    for i, q in enumerate(base["questions"]):
+        if "signature" not in q:
+            continue
+        translations = {
+            d["lang"]: d["questions"][i]
+            for d, (success, _) in zip(editions, outcomes)
+            if success and not d["questions"][i].get("unchanged")
         }
+        clients.duplicate_index.add(base["source_url"], base["quiz_date"], q["q_index"], q["content_hash"], q["signature"], translations)
+
+@metrics.timed("translate_quiz")
+def translate_quiz(quiz_data):
+    # Unchanged questions keep their stored translations, reused ones already have theirs
+    pending = [q for q in quiz_data["questions"] if not q.get("unchanged") and not q.get("reused")]
+    if not pending:
+        return quiz_data
+    
+    target = quiz_data.get("lang", "gu")
+    if TRANSLATION_MODE == "batch":
+        translate_questions_batched(pending, target)
+    else:
+        # Process all questions on the page concurrently; the shared limiter
+        # decides how many translator calls are actually in flight
+        def translate_question(q):
+            print(f"  Starting translation for question {q['q_index']}...")
+            q["text"] = translate_safe(q["text"], target)
+            q["explanation"] = translate_safe(q["explanation"], target)
+            q["options"] = {k: translate_safe(v, target) for k, v in q["options"].items()}
+            return q
         
-        is_new_quiz = False
-        existing = supabase.table("quizzes").select("id").eq("slug", quiz_data["slug"]).execute()
-        if existing.data:
-            quiz_id = existing.data[0]["id"]
-            print(f"Quiz already exists: {quiz_data['slug']}. Updating questions...")
-            supabase.table("questions").delete().eq("quiz_id", quiz_id).execute()
-            # Forcing notification even for updates to ensure user sees it working
-            is_new_quiz = True 
-        else:
-            res = supabase.table("quizzes").insert(quiz_data).execute()
-            quiz_id = res.data[0]["id"]
-            is_new_quiz = True
-        
-        # Batch insert questions for more speed
-        q_rows = []
-        for q in data["questions"]:
-            q_rows.append({
-                "quiz_id": quiz_id,
+        with ThreadPoolExecutor(max_workers=translation_limiter.max_concurrency) as executor:
+            list(executor.map(translate_question, pending))
+    return quiz_data
+
+def translate_editions(editions):
+    """Translates the editions of one page concurrently; the shared limiter caps the translator calls in flight."""
+    if len(editions) == 1:
+        return [translate_quiz(editions[0])]
+    with ThreadPoolExecutor(max_workers=len(editions)) as executor:
+        return list(executor.map(translate_quiz, editions))
+
+@metrics.timed("scrape_quiz_page")
+def scrape_quiz_page(url):
+    quiz_data = parse_quiz_page(url, fetch_quiz_page(url))
+    return translate_quiz(quiz_data)
+
+def _quiz_payload(data):
+    return {
+        "title": data["title"],
+        "slug": data["slug"],
+        "lang": data.get("lang", "gu"),
+        "date_str": data["date_str"],
+        "quiz_date": data["quiz_date"],
+        "source_url": data["source_url"],
+        "page_hash": data.get("page_hash"),
+        # Every index still on the page; anything else is pruned
+        "q_indexes": [q["q_index"] for q in data["questions"]],
+        # Unchanged questions keep their stored rows and translations
+        "questions": [
+            {
                 "q_index": q["q_index"],
                 "text": q["text"],
                 "options": q["options"],
                 "explanation": q["explanation"],
                 "answer": q["answer"],
-                "category": q["category"]
-            })
-        
-        if q_rows:
-            supabase.table("questions").insert(q_rows).execute()
-            
-        return True, is_new_quiz
-    except Exception as e:
-        print(f"Supabase error: {e}")
+                "category": q["category"],
+                "content_hash": q.get("content_hash"),
+                "duplicate_of": q.get("duplicate_of")
+            }
+            for q in data["questions"] if not q.get("unchanged")
+        ]
+    }
+
+def save_many_to_supabase(quizzes):
+    """
+    Upserts several quizzes and all their questions in one call to the configured sink
+    (a transactional RPC for Supabase).
+    
+    Returns a {slug: {"id", "inserted"}} mapping, empty if the call failed.
+    """
+    if not quizzes:
+        return {}
+    return clients.sink.save_many([_quiz_payload(d) for d in quizzes])
+
+def _save_outcome(data, saved):
+    """(success, is_new) of one quiz given its upsert_quizzes row."""
+    if not saved:
         return False, False
+    
+    changed = sum(1 for q in data["questions"] if not q.get("unchanged"))
+    if not saved["inserted"]:
+        print(f"Quiz already exists: {data['slug']}. Updated {changed} questions.")
+    # Notify for new quizzes and for updates that actually changed something
+    is_new_quiz = saved["inserted"] or changed > 0
+    return True, is_new_quiz
+
+@metrics.timed("save_editions")
+def save_editions(editions):
+    """Saves every changed edition of a page in one RPC call; returns (success, is_new) per edition."""
+    changed = [d for d in editions if not d.get("unchanged")]
+    for d in editions:
+        if d.get("unchanged"):
+            print(f"Quiz unchanged: {d['slug']}. Skipping write.")
+    saved = save_many_to_supabase(changed)
+    outcomes = [(True, False) if d.get("unchanged") else _save_outcome(d, saved.get(d["slug"])) for d in editions]
+    index_questions(editions, outcomes)
+    return outcomes
+
+@metrics.timed("publish_static_bundles")
+def publish_static_bundles(slugs):
+    """Rebuilds the static bundles and month indexes of the given quizzes from what Supabase now stores."""
+    if not slugs:
+        return
+    from static_bundles import StaticPublisher, fetch_quiz_rows, upload_to_bucket
+    try:
+        supabase = clients.supabase
+        publisher = StaticPublisher()
+        stats = publisher.publish(fetch_quiz_rows(supabase, slugs))
+        print(f"Static bundles: {stats}")
+        metrics.record_stats("static_bundles", stats)
+        if STATIC_BUCKET and publisher.written_files:
+            uploaded = upload_to_bucket(supabase, STATIC_BUCKET, publisher.directory, publisher.written_files)
+            print(f"Uploaded {uploaded} static files to bucket {STATIC_BUCKET}.")
+    except Exception as e:
+        # The database is already up to date; the next run or `python static_bundles.py` catches up
+        print(f"Static bundle error: {e}")
+
+def offline_translation_fraction():
+    """Share of translated strings served by the glossary or the cache instead of a translator call."""
+    if not clients.created("translation_cache") or not clients.created("glossary"):
+        return 0.0
+    cache = clients.translation_cache.stats
+    local = clients.glossary.composed + clients.glossary.passthrough
+    total = local + cache["hits"] + cache["misses"]
+    return round((local + cache["hits"]) / total, 3) if total else 0.0
+
+def print_store_stats():
+    """Prints the stats of the stores and providers this run created, without creating the others."""
+    if clients.created("translation_cache"):
+        print(f"Translation cache: {clients.translation_cache.stats}")
+    if clients.created("duplicate_index"):
+        print(f"Duplicate questions: {clients.duplicate_index.stats}")
+    if clients.created("glossary"):
+        print(f"Glossary: {clients.glossary.stats}, strings resolved without a translator call: {offline_translation_fraction():.1%}")
+    if clients.created("translation_router"):
+        print(f"Translation providers: {clients.translation_router.stats}")
+
+def write_run_report():
+    # A run that found nothing new never opened the stores or built the providers; reporting must not create them
+    if clients.created("translation_cache"):
+        metrics.record_stats("translation_cache", clients.translation_cache.stats)
+    if clients.created("glossary"):
+        metrics.record_stats("glossary", clients.glossary.stats)
+    if clients.created("duplicate_index"):
+        metrics.record_stats("duplicates", clients.duplicate_index.stats)
+    metrics.set_gauge("translation_offline_fraction", offline_translation_fraction())
+    metrics.record_stats("translator", translation_limiter.stats)
+    if clients.created("translation_router"):
+        for name, stats in clients.translation_router.stats.items():
+            metrics.record_stats(f"translation_provider_{name}", stats)
+    metrics.record_stats("http", clients.fetcher.stats)
+    metrics.write()
+
+def pending_urls(processed_urls):
+    """(new listing URLs, carried-over URLs not processed since, page-time estimator)."""
+    new_urls = get_new_quiz_urls(processed_urls)
+    carried, estimator = carry_over.load()
+    carried = [url for url in carried if url not in processed_urls and url not in new_urls]
+    return new_urls, carried, estimator
+
+def check_for_new_urls():
+    """Reports whether a run would have anything to scrape; reads the Gist and the listing page, writes nothing."""
+    processed_urls = get_scraped_urls_from_gist()
+    new_urls, carried, _ = pending_urls(processed_urls)
+    print(f"New URLs: {len(new_urls)}, carried over: {len(carried)}.")
+    return 0 if new_urls or carried else 1
 
 def main():
+    try:
+        scrape_new_quizzes()
+    finally:
+        clients.close_stores()
+
+def scrape_new_quizzes():
+    global run_budget
+    run_budget = RunBudget(RUN_BUDGET_MINUTES * 60 if RUN_BUDGET_MINUTES else None, margin=RUN_BUDGET_MARGIN)
     print("Starting Scraper...")
+    if not clients.writes_production:
+        print(f"Dry run: quizzes go to the {clients.sink.name} sink; Supabase, the Gist and notifications are left untouched.")
     processed_urls = get_scraped_urls_from_gist()
     print(f"Found {len(processed_urls)} already processed URLs.")
     
-    new_urls = get_new_quiz_urls(processed_urls)
+    # Carried-over pages are ones a previous run ran out of time for, even once they drop off the listing page
+    new_urls, carried, estimator = pending_urls(processed_urls)
     print(f"Found {len(new_urls)} new URLs to process.")
+    if carried:
+        print(f"Carried over from the last run: {len(carried)} URLs.")
     
-    if not new_urls:
+    if not new_urls and not carried:
         print("No new content to scrap.")
+        # Still retry notifications a previous run failed to deliver
+        if clients.writes_production:
+            clients.notification_outbox.flush()
+            carry_over.save([], estimator)
+        write_run_report()
         return
 
-    # Sort URLs to process in a predictable order (e.g. oldest first if possible)
-    new_urls.sort()
+    # Only a run with work to do pays for asyncio and the pipeline
+    from pipeline import PagePipeline, parse_concurrency
+
+    # Newest first, so today's quiz is published even if the budget runs out on older pages
+    new_urls = newest_first(new_urls + carried)
+    scheduler = DeadlineScheduler(run_budget, estimator)
     
-    for url in new_urls:
-        try:
-            quiz_data = scrape_quiz_page(url)
-            if quiz_data["questions"]:
-                success, is_new = save_to_supabase(quiz_data)
-                if success:
-                    # Send notification if it's a new quiz
-                    if is_new:
-                        print(f"Sending notifications for new quiz: {quiz_data['slug']}")
-                        notifier.send_quiz_notification(quiz_data["date_str"], quiz_data["slug"])
-                        telegram_notifier.send_quiz_notification(quiz_data["date_str"], quiz_data["slug"])
-                        
-                    # Update cache and Gist immediately after each successful URL
-                    processed_urls.append(url)
-                    update_scraped_urls_in_gist(processed_urls)
-                    print(f"Successfully processed, saved and checkpointed: {url}")
-                else:
-                    print(f"Failed to save {url} to Supabase.")
-            else:
-                print(f"No questions found on page: {url}")
-        except Exception as e:
-            print(f"Failed to process {url}: {e}")
-            # Try to save what we have if it's a transient failure between pages
-            pass
-        
-        # Short wait between pages to avoid being blocked
-        time.sleep(1)
+    def parse_stage(url, content):
+        editions = parse_editions(url, content)
+        if not editions[0]["questions"]:
+            print(f"No questions found on page: {url}")
+            return None
+        return mark_repeated_questions([mark_unchanged_questions(d) for d in editions])
+    
+    changed_slugs = []
+    
+    def persist_stage(editions):
+        if run_budget.expired():
+            # Nothing is written after the deadline; the page is carried over instead
+            print(f"Time budget used up, not saving {editions[0]['slug']}.")
+            return None
+        outcomes = save_editions(editions)
+        failed = [d["slug"] for d, (success, _) in zip(editions, outcomes) if not success]
+        if failed:
+            # Not checkpointed, so the next run retries; saved editions are skipped as unchanged
+            print(f"Failed to save {', '.join(failed)} to {clients.sink.name}.")
+            return None
+        changed_slugs.extend(d["slug"] for d in editions if not d.get("unchanged"))
+        return {"is_new": outcomes[0][1]}
+    
+    def notify_stage(url, editions, saved):
+        quiz_data = editions[0]
+        if not clients.writes_production:
+            print(f"Written to {clients.sink.name}: {url}")
+            return
+        # Queue a notification if the primary-language quiz is new
+        if saved["is_new"]:
+            print(f"Queueing notifications for new quiz: {quiz_data['slug']}")
+            clients.notification_outbox.add(quiz_data["date_str"], quiz_data["slug"])
+            
+        # Journal the URL locally right away; the Gist is written once per batch
+        processed_urls.add(url)
+        print(f"Successfully processed, saved and checkpointed: {url}")
+    
+    # Pages flow through fetch -> parse -> translate -> persist -> notify so the
+    # next page downloads while the current one is being translated.
+    pipeline = PagePipeline(
+        fetch=fetch_quiz_page,
+        parse=parse_stage,
+        translate=translate_editions,
+        persist=persist_stage,
+        notify=notify_stage,
+        concurrency=parse_concurrency(os.getenv("PIPELINE_CONCURRENCY")),
+        host_delay=POLITENESS_DELAY,
+        admit=scheduler.admit,
+        on_finished=lambda job: scheduler.finished(time.monotonic() - job.started_at),
+    )
+    results = []
+    try:
+        results = pipeline.run(new_urls)
+    finally:
+        clients.sink.close()
+        if clients.writes_production:
+            # Deferred, failed and never-finished pages; pages without questions are found again from the listing
+            empty = {job.url for job in results if job.skipped}
+            unfinished = [url for url in new_urls if url not in processed_urls and url not in empty]
+            # Deferred pages were never tried, so only the others use up an attempt
+            failed = [url for url in unfinished if url not in pipeline.deferred]
+            dropped = carry_over.save(unfinished, scheduler.estimator, failed=failed)
+            if dropped:
+                print(f"Giving up on {len(dropped)} URLs after {carry_over.max_attempts} failed runs: {', '.join(dropped)}")
+            if len(unfinished) > len(dropped):
+                print(f"Carrying {len(unfinished) - len(dropped)} unfinished URLs over to the next run.")
+            delivered = clients.notification_outbox.flush()
+            if delivered:
+                print(f"Notification digests delivered: {delivered}")
+            update_scraped_urls_in_gist(processed_urls)
+            if STATIC_BUNDLES:
+                publish_static_bundles(changed_slugs)
         
+    print_store_stats()
+    print(f"Translator throughput: {translation_limiter.stats}")
+    print(f"HTTP fetches: {clients.fetcher.stats}")
+    print(f"Schedule: {scheduler.stats}")
+    metrics.record_stats("schedule", scheduler.stats)
+    metrics.set_gauge("schedule_deferred", len(pipeline.deferred))
+    write_run_report()
     print("Scraping Task Completed.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape new IndiaBix current-affairs quizzes, translate and publish them.")
+    parser.add_argument("--check", action="store_true", help="only report whether there is anything new: exit 0 if so, 1 if not")
+    if parser.parse_args().check:
+        sys.exit(check_for_new_urls())
     main()
@@ -1,24 +1,75 @@
 import requests
+import hashlib
 import json
 import logging
 import os
-from typing import Optional
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from instrumentation import metrics
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_OUTBOX_PATH = os.path.join(".cache", "notification_outbox.json")
+
+# (date_str, quiz_slug)
+QuizRef = Tuple[str, str]
+
+# Telegram rejects longer messages; it counts UTF-16 code units
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+# Quizzes listed one by one in a digest; older ones are only counted
+DIGEST_MAX_QUIZZES = 20
+
+
+def _pooled_session(retries: int = 3, backoff: float = 1.0, retry_reads: bool = True) -> requests.Session:
+    """
+    Keep-alive session that retries connection errors, 429s and 5xx responses.
+
+    Args:
+        retries: Attempts after the first one
+        backoff: Base of the exponential backoff in seconds
+        retry_reads: Whether to resend after a read timeout. The server may have
+            acted on the first request, so this is only safe with an idempotency key.
+    """
+    retry = Retry(
+        total=retries,
+        read=None if retry_reads else 0,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class NotificationSender:
     """Handles sending push notifications via OneSignal REST API."""
     
-    def __init__(self, app_id: Optional[str] = None, api_key: Optional[str] = None):
+    name = "onesignal"
+    
+    def __init__(self, app_id: Optional[str] = None, api_key: Optional[str] = None, api_url: Optional[str] = None, timeout: float = 15):
         """
         Initialize the notification sender.
         
         Args:
             app_id: OneSignal App ID
             api_key: OneSignal REST API Key
+            api_url: Notifications endpoint, overridable to point at a local stub server
+            timeout: Request timeout in seconds
         """
         self.app_id = (app_id or os.getenv("ONESIGNAL_APP_ID", "")).strip()
         self.api_key = (api_key or os.getenv("ONESIGNAL_REST_API_KEY", "")).strip()
+        self.api_url = (api_url or os.getenv("ONESIGNAL_API_URL", "https://onesignal.com/api/v1/notifications")).strip()
+        self.timeout = timeout
+        self.session = _pooled_session()
         
         if not self.app_id or not self.api_key:
             logger.warning("OneSignal App ID or API Key missing. Notifications will be skipped.")
@@ -41,18 +92,46 @@ class NotificationSender:
         Returns:
             True if successful, False otherwise
         """
-        if not self.enabled:
-            return False
+        return self.send_digest_notification([(date_str, quiz_slug)])
 
-        url = "https://onesignal.com/api/v1/notifications"
+    @staticmethod
+    def idempotency_key(quizzes: List[QuizRef]) -> str:
+        """UUID derived from the digest's slugs, so a retried or replayed digest is delivered only once."""
+        digest = hashlib.sha256("\n".join(sorted(slug for _, slug in quizzes)).encode("utf-8")).digest()
+        return str(uuid.UUID(bytes=digest[:16], version=4))
+
+    @metrics.timed("notify_onesignal")
+    def send_digest_notification(self, quizzes: List[QuizRef]) -> bool:
+        """
+        Send one notification covering every quiz published in this run.
         
+        Args:
+            quizzes: (date_str, quiz_slug) pairs, oldest first; the link opens the last one
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled or not quizzes:
+            return False
+
         # Build the message
+        date_str, quiz_slug = quizzes[-1]
         title = "🎯 IndiaBix નવી ક્વિઝ ઉપલબ્ધ છે!"
-        message = f"તારીખ {date_str} IndiaBixની ડેઈલી કરંટ અફેસ ક્વિઝ લાઈવ થઈ ગઈ છે. હમણાં જ રમો!"
+        if len(quizzes) == 1:
+            message = f"તારીખ {date_str} IndiaBixની ડેઈલી કરંટ અફેસ ક્વિઝ લાઈવ થઈ ગઈ છે. હમણાં જ રમો!"
+        else:
+            # Like the Telegram digest, a backlog lists only its newest quizzes
+            shown = quizzes[-DIGEST_MAX_QUIZZES:]
+            dates = ", ".join(d for d, _ in shown)
+            if len(shown) < len(quizzes):
+                dates += f" અને બીજી {len(quizzes) - len(shown)}"
+            message = f"IndiaBixની {len(quizzes)} નવી ડેઈલી કરંટ અફેસ ક્વિઝ લાઈવ થઈ ગઈ છે ({dates}). હમણાં જ રમો!"
         launch_url = f"https://currentadda.vercel.app/quiz/{quiz_slug}"
 
         payload = {
             "app_id": self.app_id,
+            # OneSignal drops a second request with the same key, which makes retrying a timed-out POST safe
+            "idempotency_key": self.idempotency_key(quizzes),
             # Use filters instead of segments for 100% targeting
             "filters": [
                 {"field": "last_session", "relation": ">", "value": "0"}
@@ -68,7 +147,7 @@ class NotificationSender:
         }
 
         try:
-            response = requests.post(url, headers=self.header, data=json.dumps(payload))
+            response = self.session.post(self.api_url, headers=self.header, data=json.dumps(payload), timeout=self.timeout)
             response_data = response.json()
             
             if response.status_code == 200:
@@ -89,11 +168,18 @@ class NotificationSender:
 class TelegramSender:
     """Handles sending notifications to Telegram via Bot API."""
     
-    def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None, base_url: Optional[str] = None):
+    name = "telegram"
+    
+    def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None, base_url: Optional[str] = None, api_url: Optional[str] = None, timeout: float = 15):
         self.bot_token = (bot_token or os.getenv("TELEGRAM_BOT_TOKEN", "")).strip()
         self.chat_id = (chat_id or os.getenv("TELEGRAM_CHAT_ID", "")).strip()
         self.base_url = (base_url or os.getenv("DOMAIN_URL", "https://currentadda.vercel.app")).strip().rstrip("/")
         self.channel_link = os.getenv("TELEGRAM_CHANNEL_LINK", "https://t.me/currentadda").strip()
+        # Bot API root, overridable to point at a local stub server
+        self.api_url = (api_url or os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")).strip().rstrip("/")
+        self.timeout = timeout
+        # sendMessage has no idempotency key, so a read timeout is not retried
+        self.session = _pooled_session(retry_reads=False)
         
         if not self.bot_token or not self.chat_id:
             logger.warning("Telegram Bot Token or Chat ID missing. Telegram notifications will be skipped.")
@@ -102,34 +188,63 @@ class TelegramSender:
             self.enabled = True
 
     def send_quiz_notification(self, date_str: str, quiz_slug: str) -> bool:
-        if not self.enabled:
-            return False
+        return self.send_digest_notification([(date_str, quiz_slug)])
 
-        quiz_url = f"{self.base_url}/quiz/{quiz_slug}"
-        
-        # Beautifully formatted message in Gujarati
-        message = (
-            f"🎯 *IndiaBix નવી ડેઈલી કરંટ અફેસ ક્વિઝ લાઈવ!*\n\n"
-            f"📅 *તારીખ:* {date_str}\n\n"
-            f"📝 દરેક પ્રશ્નના જવાબ સાથે સમજૂતી પણ આપવામાં આવેલ છે.\n\n"
-            f"🔗 *ક્વિઝ રમવા માટે નીચેની લિંક પર ક્લિક કરો:*\n"
-            f"{quiz_url}\n\n"
+    def _format_message(self, quizzes: List[QuizRef], max_links: int) -> str:
+        """Message for quizzes (oldest first), linking at most the newest max_links of them."""
+        if len(quizzes) == 1:
+            date_str, quiz_slug = quizzes[0]
+            quiz_url = f"{self.base_url}/quiz/{quiz_slug}"
+            
+            # Beautifully formatted message in Gujarati
+            body = (
+                f"🎯 *IndiaBix નવી ડેઈલી કરંટ અફેસ ક્વિઝ લાઈવ!*\n\n"
+                f"📅 *તારીખ:* {date_str}\n\n"
+                f"📝 દરેક પ્રશ્નના જવાબ સાથે સમજૂતી પણ આપવામાં આવેલ છે.\n\n"
+                f"🔗 *ક્વિઝ રમવા માટે નીચેની લિંક પર ક્લિક કરો:*\n"
+                f"{quiz_url}\n\n"
+            )
+        else:
+            shown = quizzes[-max_links:]
+            links = "".join(f"📅 {d}\n🔗 {self.base_url}/quiz/{s}\n\n" for d, s in shown)
+            if len(shown) < len(quizzes):
+                links += f"➕ અને બીજી {len(quizzes) - len(shown)} ક્વિઝ: {self.base_url}\n\n"
+            body = (
+                f"🎯 *IndiaBix ની {len(quizzes)} નવી ડેઈલી કરંટ અફેસ ક્વિઝ લાઈવ!*\n\n"
+                f"📝 દરેક પ્રશ્નના જવાબ સાથે સમજૂતી પણ આપવામાં આવેલ છે.\n\n"
+                f"{links}"
+            )
+        return (
+            f"{body}"
             f"━━━━━━━━━━━━━━━\n"
             f"📢 વધુ અપડેટ્સ માટે અમારી ચેનલ જોઈન કરો:\n"
             f"👉 {self.channel_link}\n\n"
             f"#CurrentAffairs #IndiaBix #DailyQuiz #GSSSB #GPSC #GujaratGK #CurrentAdda"
         )
 
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+    @metrics.timed("notify_telegram")
+    def send_digest_notification(self, quizzes: List[QuizRef]) -> bool:
+        if not self.enabled or not quizzes:
+            return False
+
+        # A large backlog (e.g. after a backfill) links the newest quizzes and counts the rest,
+        # so the digest always fits in one message instead of being rejected on every run
+        max_links = DIGEST_MAX_QUIZZES
+        message = self._format_message(quizzes, max_links)
+        while max_links > 1 and len(message.encode("utf-16-le")) // 2 > TELEGRAM_MAX_MESSAGE_LENGTH:
+            max_links -= 1
+            message = self._format_message(quizzes, max_links)
+
+        url = f"{self.api_url}/bot{self.bot_token}/sendMessage"
         payload = {
             "chat_id": self.chat_id,
             "text": message,
             "parse_mode": "Markdown",
-            "disable_web_page_preview": False
+            "disable_web_page_preview": len(quizzes) > 1
         }
 
         try:
-            response = requests.post(url, json=payload)
+            response = self.session.post(url, json=payload, timeout=self.timeout)
             if response.status_code == 200:
                 logger.info("✅ Telegram: Notification sent successfully!")
                 return True
@@ -139,3 +254,81 @@ class TelegramSender:
         except Exception as e:
             logger.error(f"❌ Telegram Network Error: {str(e)}")
             return False
+
+class NotificationOutbox:
+    """
+    Collects quizzes published during a run and sends one digest per channel.
+    
+    Queued quizzes are persisted as soon as they are added and removed only once
+    a channel accepts them, so anything that failed (or a run that crashed before
+    flushing) is replayed on the next run.
+    """
+    
+    def __init__(self, senders: List, path: Optional[str] = None):
+        """
+        Args:
+            senders: Channel senders exposing `name`, `enabled` and `send_digest_notification`
+            path: JSON file holding pending quizzes per channel
+        """
+        self.senders = senders
+        self.path = path or os.getenv("NOTIFICATION_OUTBOX_PATH", DEFAULT_OUTBOX_PATH)
+        self._lock = threading.Lock()
+        self.pending: Dict[str, List[QuizRef]] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                self.pending = {name: [tuple(q) for q in quizzes] for name, quizzes in stored.items()}
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ Could not read notification outbox: {e}")
+        replay = sum(len(q) for q in self.pending.values())
+        if replay:
+            logger.info(f"Replaying {replay} undelivered notification(s) from a previous run.")
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        pending = {name: quizzes for name, quizzes in self.pending.items() if quizzes}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(pending, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def add(self, date_str: str, quiz_slug: str) -> None:
+        """Queue a quiz for every enabled channel."""
+        with self._lock:
+            for sender in self.senders:
+                if not sender.enabled:
+                    continue
+                queue = self.pending.setdefault(sender.name, [])
+                if not any(slug == quiz_slug for _, slug in queue):
+                    queue.append((date_str, quiz_slug))
+            self._save()
+
+    def flush(self) -> Dict[str, bool]:
+        """
+        Send each channel's pending quizzes as one digest, all channels concurrently.
+        
+        Returns:
+            {channel name: delivered} for every channel that had something to send
+        """
+        with self._lock:
+            work = [(s, sorted(self.pending.get(s.name, []), key=lambda q: q[1])) for s in self.senders if s.enabled]
+            work = [(s, quizzes) for s, quizzes in work if quizzes]
+            if not work:
+                return {}
+            
+            with ThreadPoolExecutor(max_workers=len(work)) as executor:
+                results = list(executor.map(lambda w: w[0].send_digest_notification(w[1]), work))
+            
+            delivered = {}
+            for (sender, quizzes), ok in zip(work, results):
+                delivered[sender.name] = ok
+                if ok:
+                    sent = {slug for _, slug in quizzes}
+                    self.pending[sender.name] = [q for q in self.pending[sender.name] if q[1] not in sent]
+                else:
+                    logger.error(f"❌ {sender.name}: digest of {len(quizzes)} quiz(zes) failed, kept for the next run.")
+            self._save()
+            return delivered
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("fetch", "parse", "translate", "persist", "notify")
+
+DEFAULT_CONCURRENCY = {
+    "fetch": 2,
+    "parse": 2,
+    "translate": 1,
+    "persist": 2,
+}
+
+_DONE = object()
+
+
+class PageJob:
+    """One URL travelling through the pipeline."""
+
+    def __init__(self, seq: int, url: str):
+        self.seq = seq
+        self.url = url
+        self.data: Any = None
+        self.error: Optional[str] = None
+        self.skipped = False
+        self.persist_result: Any = None
+        self.started_at = time.monotonic()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+class HostThrottle:
+    """Enforces a minimum delay between requests to the same host."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last: Dict[str, float] = {}
+
+    async def wait(self, url: str) -> None:
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            elapsed = time.monotonic() - self._last.get(host, 0.0)
+            if elapsed < self.delay:
+                await asyncio.sleep(self.delay - elapsed)
+            self._last[host] = time.monotonic()
+
+
+def parse_concurrency(spec: Optional[str]) -> Dict[str, int]:
+    """Parses "fetch=2,translate=1" style overrides on top of the defaults."""
+    limits = dict(DEFAULT_CONCURRENCY)
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        name, value = part.split("=", 1)
+        name = name.strip()
+        if name in limits:
+            limits[name] = max(1, int(value))
+    return limits
+
+
+class PagePipeline:
+    """
+    Staged fetch -> parse -> translate -> persist -> notify pipeline.
+
+    Stages are connected by bounded queues so a page can be downloaded and parsed
+    while the previous one is still being translated. Blocking stage callables run
+    in worker threads. The notify stage is a single consumer that releases pages
+    strictly in input order, so checkpoints are recorded in the same order the
+    URLs were given.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Any],
+        parse: Callable[[str, Any], Any],
+        translate: Callable[[Any], Any],
+        persist: Callable[[Any], Any],
+        notify: Callable[[str, Any, Any], None],
+        concurrency: Optional[Dict[str, int]] = None,
+        queue_size: int = 2,
+        host_delay: float = 1.0,
+        admit: Optional[Callable[[str], bool]] = None,
+        on_finished: Optional[Callable[[PageJob], None]] = None,
+    ):
+        """
+        Args:
+            fetch: url -> raw response content
+            parse: (url, content) -> parsed page, or a falsy value to skip the page
+            translate: parsed page -> translated page
+            persist: translated page -> persist result, or a falsy value on failure
+            notify: (url, page, persist result) -> None, called in input order for successful pages
+            concurrency: Per-stage worker counts, defaults to DEFAULT_CONCURRENCY
+            queue_size: Capacity of each inter-stage queue
+            host_delay: Minimum seconds between two fetches to the same host
+            admit: url -> whether to start it; the first refusal stops the feed and
+                that URL and the rest end up in self.deferred
+            on_finished: Called with every admitted job once it leaves the pipeline
+        """
+        self.fetch = fetch
+        self.parse = parse
+        self.translate = translate
+        self.persist = persist
+        self.notify = notify
+        self.concurrency = dict(DEFAULT_CONCURRENCY, **(concurrency or {}))
+        self.queue_size = queue_size
+        self.throttle = HostThrottle(host_delay)
+        self.admit = admit
+        self.on_finished = on_finished
+        self.deferred: List[str] = []
+
+    async def _worker(self, name: str, handler, inbox: asyncio.Queue, outbox: asyncio.Queue) -> None:
+        while True:
+            job = await inbox.get()
+            if job is _DONE:
+                return
+            if job.ok:
+                try:
+                    await handler(job)
+                except Exception as e:
+                    job.error = f"{name}: {e}"
+                    print(f"Failed to process {job.url}: {job.error}")
+            await outbox.put(job)
+
+    async def _stage(self, name: str, handler, inbox: asyncio.Queue, outbox: asyncio.Queue, downstream: int) -> None:
+        # Every worker exits on its own _DONE; once they have all drained the
+        # inbox, hand one _DONE to each worker of the next stage.
+        workers = [
+            asyncio.ensure_future(self._worker(name, handler, inbox, outbox))
+            for _ in range(self.concurrency[name])
+        ]
+        await asyncio.gather(*workers)
+        for _ in range(downstream):
+            await outbox.put(_DONE)
+
+    async def _fetch(self, job: PageJob) -> None:
+        job.started_at = time.monotonic()
+        await self.throttle.wait(job.url)
+        job.data = await asyncio.to_thread(self.fetch, job.url)
+
+    async def _parse(self, job: PageJob) -> None:
+        job.data = await asyncio.to_thread(self.parse, job.url, job.data)
+        if not job.data:
+            job.skipped = True
+
+    async def _translate(self, job: PageJob) -> None:
+        job.data = await asyncio.to_thread(self.translate, job.data)
+
+    async def _persist(self, job: PageJob) -> None:
+        result = await asyncio.to_thread(self.persist, job.data)
+        if not result:
+            job.error = "persist failed"
+        job.persist_result = result
+
+    async def _release_in_order(self, inbox: asyncio.Queue, results: List[PageJob]) -> None:
+        pending: Dict[int, PageJob] = {}
+        next_seq = 0
+        while True:
+            job = await inbox.get()
+            if job is _DONE:
+                break
+            pending[job.seq] = job
+            while next_seq in pending:
+                ready = pending.pop(next_seq)
+                next_seq += 1
+                if ready.ok:
+                    try:
+                        await asyncio.to_thread(self.notify, ready.url, ready.data, ready.persist_result)
+                    except Exception as e:
+                        ready.error = f"notify: {e}"
+                        print(f"Failed to process {ready.url}: {ready.error}")
+                results.append(ready)
+                if self.on_finished:
+                    self.on_finished(ready)
+
+    async def _run(self, urls: List[str]) -> List[PageJob]:
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(len(STAGES))]
+        feed = queues[0]
+        results: List[PageJob] = []
+        handlers = [self._fetch, self._parse, self._translate, self._persist]
+
+        tasks = []
+        for i, (name, handler) in enumerate(zip(STAGES, handlers)):
+            # The notify stage releases pages in order from a single consumer
+            downstream = self.concurrency.get(STAGES[i + 1], 1)
+            tasks.append(asyncio.ensure_future(self._stage(name, handler, queues[i], queues[i + 1], downstream)))
+        tasks.append(asyncio.ensure_future(self._release_in_order(queues[-1], results)))
+
+        self.deferred = []
+        for seq, url in enumerate(urls):
+            if self.admit and not self.admit(url):
+                self.deferred = list(urls[seq:])
+                break
+            await feed.put(PageJob(seq, url))
+        for _ in range(self.concurrency["fetch"]):
+            await feed.put(_DONE)
+        await asyncio.gather(*tasks)
+        return results
+
+    def run(self, urls: List[str]) -> List[PageJob]:
+        """Runs the URLs through the pipeline and returns the admitted jobs in input order."""
+        return asyncio.run(self._run(urls))
@@ -0,0 +1,194 @@
+import logging
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RetryBudgetExceeded(Exception):
+    """Raised when a call runs out of retries or hits its deadline."""
+
+
+class AdaptiveLimiter:
+    """
+    Run-wide token bucket with AIMD (additive increase, multiplicative decrease) control.
+
+    Every call first takes a concurrency slot and then a token. Successful calls
+    slowly raise both the refill rate and the number of slots; an error halves
+    them, so a throttling backend sees the whole run back off at once instead of
+    each worker retrying on its own.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        min_rate: float = 0.5,
+        max_rate: float = 20.0,
+        concurrency: int = 5,
+        max_concurrency: int = 12,
+        rate_step: float = 0.5,
+        decrease_factor: float = 0.5,
+        successes_per_slot: int = 10,
+    ):
+        """
+        Args:
+            rate: Initial tokens per second
+            min_rate: Floor for the refill rate after repeated errors
+            max_rate: Ceiling for the refill rate
+            concurrency: Initial number of calls allowed in flight
+            max_concurrency: Ceiling for calls in flight, also the size worker pools should use
+            rate_step: Tokens per second added after each success
+            decrease_factor: Multiplier applied to rate and concurrency on error
+            successes_per_slot: Consecutive successes needed to open one more slot
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.rate_step = rate_step
+        self.decrease_factor = decrease_factor
+        self.successes_per_slot = successes_per_slot
+
+        self._cond = threading.Condition()
+        self._tokens = float(concurrency)
+        self._last_refill = time.monotonic()
+        self._in_flight = 0
+        self._streak = 0
+
+        self.started_at = time.monotonic()
+        self.calls = 0
+        self.successes = 0
+        self.errors = 0
+        self.retries = 0
+        self.give_ups = 0
+        self.peak_concurrency = concurrency
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        # Burst is capped at the current concurrency so a quiet period cannot
+        # unleash a flood of requests once traffic resumes.
+        self._tokens = min(float(self.concurrency), self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """
+        Block until a slot and a token are available.
+
+        Args:
+            deadline: time.monotonic() value after which to stop waiting
+
+        Returns:
+            True once acquired, False if the deadline passed first
+        """
+        with self._cond:
+            while True:
+                self._refill()
+                if self._in_flight < self.concurrency and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    self.calls += 1
+                    return True
+                wait = 0.05 if self._in_flight >= self.concurrency else (1 - self._tokens) / self.rate
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+
+    def release(self, success: bool) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if success:
+                self.successes += 1
+                self._streak += 1
+                self.rate = min(self.max_rate, self.rate + self.rate_step)
+                if self._streak >= self.successes_per_slot and self.concurrency < self.max_concurrency:
+                    self.concurrency += 1
+                    self.peak_concurrency = max(self.peak_concurrency, self.concurrency)
+                    self._streak = 0
+            else:
+                self.errors += 1
+                self._streak = 0
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self.concurrency = max(1, int(self.concurrency * self.decrease_factor))
+            self._cond.notify_all()
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        max_retries: int = 5,
+        timeout: Optional[float] = None,
+        label: str = "",
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ) -> T:
+        """
+        Run fn under the limiter, retrying failures with jittered exponential backoff.
+
+        Args:
+            fn: Zero-argument callable performing one attempt
+            max_retries: Retries allowed after the first attempt
+            timeout: Overall seconds allowed for all attempts, including waits
+            label: Short description used in log lines
+            base_backoff: First backoff delay in seconds
+            max_backoff: Upper bound on a single backoff delay
+
+        Returns:
+            The value returned by the first successful attempt
+
+        Raises:
+            RetryBudgetExceeded: If every attempt failed or the deadline passed
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        wait_time = base_backoff
+        last_error: Optional[Exception] = None
+
+        for attempt in range(max_retries + 1):
+            if not self.acquire(deadline):
+                break
+            try:
+                result = fn()
+            except Exception as e:
+                self.release(False)
+                last_error = e
+                print(f"    [Attempt {attempt + 1}] {label} failed. Error: {e}")
+            else:
+                self.release(True)
+                return result
+
+            if attempt == max_retries:
+                break
+            actual_wait = wait_time * random.uniform(0.5, 1.5)
+            if deadline is not None and time.monotonic() + actual_wait >= deadline:
+                break
+            with self._cond:
+                self.retries += 1
+            print(f"    Waiting {actual_wait:.2f}s before retry...")
+            time.sleep(actual_wait)
+            wait_time = min(wait_time * 2, max_backoff)
+
+        with self._cond:
+            self.give_ups += 1
+        reason = last_error if last_error is not None else "deadline reached"
+        raise RetryBudgetExceeded(f"Gave up on {label!r} after {attempt + 1} attempt(s): {reason}")
+
+    @property
+    def stats(self) -> dict:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "errors": self.errors,
+            "retries": self.retries,
+            "give_ups": self.give_ups,
+            "throughput_per_sec": round(self.successes / elapsed, 2),
+            "rate": round(self.rate, 2),
+            "concurrency": self.concurrency,
+            "peak_concurrency": self.peak_concurrency,
+        }
@@ -0,0 +1,205 @@
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CARRY_OVER_PATH = os.path.join(".cache", "carry_over.json")
+# Runs a URL may fail in before it is no longer carried over
+DEFAULT_MAX_ATTEMPTS = 3
+# Seconds reserved after the deadline for the Gist sync, notifications and reports
+DEFAULT_MARGIN = 120.0
+
+_URL_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+
+
+def newest_first(urls: List[str]) -> List[str]:
+    """Orders quiz URLs by the date in them, most recent first; undated URLs go last."""
+    def key(url):
+        match = _URL_DATE_RE.search(url)
+        return (match.group(1) if match else "", url)
+    return sorted(set(urls), key=key, reverse=True)
+
+
+class RunBudget:
+    """Wall-clock budget of a run. Without a budget nothing ever expires."""
+
+    def __init__(self, seconds: Optional[float] = None, margin: float = DEFAULT_MARGIN):
+        """
+        Args:
+            seconds: Total time the run may take, None for no limit
+            margin: Seconds kept free at the end for checkpointing and reporting
+        """
+        self.started = time.monotonic()
+        self.deadline = self.started + max(0.0, seconds - margin) if seconds else None
+
+    @property
+    def limited(self) -> bool:
+        return self.deadline is not None
+
+    def remaining(self) -> float:
+        if self.deadline is None:
+            return math.inf
+        return self.deadline - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cap(self, timeout: float) -> float:
+        """timeout, shortened so it ends by the deadline (never 0, which would mean no timeout)."""
+        return max(0.01, min(timeout, self.remaining()))
+
+
+class PageTimeEstimator:
+    """
+    Exponentially weighted averages of page latency and of the gap between finished pages.
+
+    Latency is how long one page takes from its fetch to its checkpoint; the gap
+    reflects throughput while several pages overlap in the pipeline. Without any
+    history (first run, nothing finished yet) there is no estimate and pages are
+    admitted freely.
+    """
+
+    def __init__(self, latency: Optional[float] = None, interval: Optional[float] = None, alpha: float = 0.3):
+        """
+        Args:
+            latency: Starting estimate of seconds per page, usually from the previous run
+            interval: Starting estimate of seconds between finished pages, defaults to latency
+            alpha: Weight of the newest observation
+        """
+        self.latency = latency
+        self.interval = interval if interval is not None else latency
+        self.alpha = alpha
+        self.samples = 0
+        self._last_finish: Optional[float] = None
+
+    def _blend(self, current: Optional[float], value: float) -> float:
+        return value if current is None else current + self.alpha * (value - current)
+
+    def observe(self, latency: float, finished_at: float) -> None:
+        self.latency = self._blend(self.latency, latency)
+        if self._last_finish is not None:
+            self.interval = self._blend(self.interval, max(0.0, finished_at - self._last_finish))
+        elif self.interval is None:
+            self.interval = latency
+        self._last_finish = finished_at
+        self.samples += 1
+
+    def time_to_finish(self, in_flight: int) -> float:
+        """Expected seconds until a page admitted now is done, with in_flight pages ahead of it; 0 without history."""
+        if self.latency is None:
+            return 0.0
+        return max(self.latency, (in_flight + 1) * self.interval)
+
+
+class DeadlineScheduler:
+    """
+    Admits pages into the pipeline only while they are expected to finish before the deadline.
+
+    Pages left out are deferred to the next run through the carry-over file. Pages
+    already admitted run to completion; the caller refuses to persist anything once
+    the budget has expired, so a page is either fully published or not at all.
+    """
+
+    def __init__(self, budget: RunBudget, estimator: PageTimeEstimator):
+        self.budget = budget
+        self.estimator = estimator
+        self.admitted = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def admit(self, url: str) -> bool:
+        with self._lock:
+            if self.budget.limited:
+                needed = self.estimator.time_to_finish(self.in_flight)
+                if needed > self.budget.remaining():
+                    print(f"Time budget: {self.budget.remaining():.0f}s left, a page needs ~{needed:.0f}s; deferring {url} and later pages.")
+                    return False
+            self.admitted += 1
+            self.in_flight += 1
+            return True
+
+    def finished(self, latency: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.estimator.observe(latency, time.monotonic())
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "admitted": self.admitted,
+            "page_seconds": round(self.estimator.latency, 1) if self.estimator.latency is not None else None,
+            "interval_seconds": round(self.estimator.interval, 1) if self.estimator.interval is not None else None,
+            "remaining_seconds": round(self.budget.remaining(), 1) if self.budget.limited else None,
+        }
+
+
+class CarryOver:
+    """
+    Unfinished URLs and the latest throughput estimates, handed from one run to the next.
+
+    Each URL's failed runs are counted, and one that has failed max_attempts
+    runs is dropped instead of being retried forever. Pages deferred for lack
+    of time do not count.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_attempts: Optional[int] = None):
+        """
+        Args:
+            path: JSON file location, defaults to CARRY_OVER_PATH or .cache/carry_over.json
+            max_attempts: Failed runs before a URL is dropped, defaults to CARRY_OVER_MAX_ATTEMPTS or 3
+        """
+        self.path = path or os.getenv("CARRY_OVER_PATH", DEFAULT_CARRY_OVER_PATH)
+        self.max_attempts = max_attempts or int(os.getenv("CARRY_OVER_MAX_ATTEMPTS", str(DEFAULT_MAX_ATTEMPTS)))
+        self.attempts: Dict[str, int] = {}
+
+    def load(self) -> Tuple[List[str], PageTimeEstimator]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return [], PageTimeEstimator()
+        except ValueError:
+            logger.warning(f"Ignoring unreadable carry-over file {self.path}")
+            return [], PageTimeEstimator()
+        self.attempts = dict(data.get("attempts", {}))
+        estimator = PageTimeEstimator(latency=data.get("page_seconds"), interval=data.get("interval_seconds"))
+        return list(data.get("urls", [])), estimator
+
+    def save(self, urls: List[str], estimator: PageTimeEstimator, failed: Iterable[str] = ()) -> List[str]:
+        """
+        Write the URLs for the next run, counting a failed run for each URL in failed.
+
+        Args:
+            urls: Every URL this run left unfinished
+            estimator: Page-time estimates to start the next run from
+            failed: The URLs among them that were tried and did not finish
+
+        Returns:
+            The URLs dropped for having failed max_attempts runs
+        """
+        failed = set(failed)
+        attempts = {url: self.attempts.get(url, 0) + (url in failed) for url in urls}
+        dropped = newest_first([url for url, count in attempts.items() if count >= self.max_attempts])
+        for url in dropped:
+            logger.warning(f"Dropping {url} from the carry-over after {attempts.pop(url)} failed runs")
+        self.attempts = {url: count for url, count in attempts.items() if count}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "urls": newest_first(list(attempts)),
+                "attempts": self.attempts,
+                "page_seconds": round(estimator.latency, 3) if estimator.latency is not None else None,
+                "interval_seconds": round(estimator.interval, 3) if estimator.interval is not None else None,
+            }, f, indent=2)
+        os.replace(tmp, self.path)
+        return dropped
@@ -0,0 +1,161 @@
+import datetime
+import gzip
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = os.path.join("output", "quizzes")
+DEFAULT_SHARD_SIZE = 500
+
+
+class QuizSink:
+    """
+    Destination for scraped quizzes.
+
+    Payloads have the shape upsert_quizzes takes: quiz fields, q_indexes and the
+    changed questions. writes_production is False for sinks that leave Supabase,
+    the Gist and notifications untouched, which makes the run a dry run.
+    """
+
+    name = "sink"
+    writes_production = True
+
+    def existing_hashes(self, slug: str) -> Tuple[Optional[str], Dict[int, str]]:
+        """Returns (page_hash, {q_index: content_hash}) of a stored quiz, or (None, {}) if there is none."""
+        return None, {}
+
+    def save_many(self, payloads: List[dict]) -> Dict[str, dict]:
+        """Stores the payloads; returns {slug: {"slug", "id", "inserted"}}, missing slugs failed."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SupabaseSink(QuizSink):
+    """Writes through the upsert_quizzes RPC of a supabase-py client."""
+
+    name = "supabase"
+
+    def __init__(self, client):
+        """
+        Args:
+            client: supabase-py Client
+        """
+        self.client = client
+
+    def existing_hashes(self, slug: str) -> Tuple[Optional[str], Dict[int, str]]:
+        try:
+            res = self.client.table("quizzes").select("page_hash, questions(q_index, content_hash)").eq("slug", slug).execute()
+        except Exception as e:
+            print(f"Supabase error: {e}")
+            return None, {}
+        if not res.data:
+            return None, {}
+        row = res.data[0]
+        return row.get("page_hash"), {q["q_index"]: q["content_hash"] for q in row.get("questions") or []}
+
+    def save_many(self, payloads: List[dict]) -> Dict[str, dict]:
+        if not payloads:
+            return {}
+        try:
+            res = self.client.rpc("upsert_quizzes", {"payload": payloads}).execute()
+            return {row["slug"]: row for row in res.data}
+        except Exception as e:
+            print(f"Supabase error: {e}")
+            return {}
+
+
+class JsonlSink(QuizSink):
+    """
+    Streams payloads to local JSON Lines shards, one quiz per line.
+
+    Each run writes quizzes-<timestamp>-<n>.jsonl[.gz] files of at most shard_size
+    quizzes, flushing after every quiz so a crash loses at most the line being
+    written. bulk_load.py ingests the shards into Postgres.
+    """
+
+    name = "jsonl"
+    writes_production = False
+
+    def __init__(self, directory: Optional[str] = None, compress: bool = True, shard_size: int = DEFAULT_SHARD_SIZE):
+        """
+        Args:
+            directory: Output directory, defaults to SINK_DIR or output/quizzes
+            compress: Write gzip-compressed shards
+            shard_size: Quizzes per shard before a new file is started
+        """
+        self.directory = directory or os.getenv("SINK_DIR", DEFAULT_OUTPUT_DIR)
+        self.compress = compress
+        self.shard_size = shard_size
+        self.run_id = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self.paths: List[str] = []
+        self.quizzes = 0
+        self._file = None
+        self._in_shard = 0
+        self._lock = threading.Lock()
+
+    def _open_shard(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        path = os.path.join(self.directory, f"quizzes-{self.run_id}-{len(self.paths):05d}{suffix}")
+        self._file = gzip.open(path, "wt", encoding="utf-8") if self.compress else open(path, "w", encoding="utf-8")
+        self.paths.append(path)
+        self._in_shard = 0
+
+    def save_many(self, payloads: List[dict]) -> Dict[str, dict]:
+        saved = {}
+        with self._lock:
+            for payload in payloads:
+                if self._file is None or self._in_shard >= self.shard_size:
+                    self.close_shard()
+                    self._open_shard()
+                self._file.write(json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n")
+                self._file.flush()
+                self._in_shard += 1
+                self.quizzes += 1
+                saved[payload["slug"]] = {"slug": payload["slug"], "id": None, "inserted": True}
+        return saved
+
+    def close_shard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        with self._lock:
+            self.close_shard()
+        if self.paths:
+            print(f"Wrote {self.quizzes} quizzes to {len(self.paths)} shard(s) in {self.directory}")
+
+
+def make_sink(kind: str, supabase_client=None) -> QuizSink:
+    """Builds the sink named by SINK: "supabase" (default) or "jsonl"."""
+    kind = (kind or "supabase").lower()
+    if kind == "supabase":
+        return SupabaseSink(supabase_client)
+    if kind == "jsonl":
+        return JsonlSink(
+            compress=os.getenv("SINK_COMPRESS", "1").lower() in ("1", "true", "yes"),
+            shard_size=int(os.getenv("SINK_SHARD_SIZE", str(DEFAULT_SHARD_SIZE))),
+        )
+    raise ValueError(f"Unknown SINK: {kind} (expected supabase or jsonl)")
+
+
+def read_shard(path: str) -> Iterator[dict]:
+    """Yields the payloads of one shard, stopping quietly at a line cut off by a crash."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping truncated line in {path}")
+                    return
+        except (EOFError, gzip.BadGzipFile):
+            logger.warning(f"{path} ends early; loaded everything before the cut")
@@ -0,0 +1,289 @@
+"""
+Publish quizzes as static, precompressed JSON for a private storage bucket.
+
+Every quiz becomes quiz/<slug>.json (plus .json.gz and, with the brotli
+package installed, .json.br), and every language gets per-month indexes in
+index/<lang>/<YYYY-MM>.json and a list of months in index/<lang>/months.json.
+manifest.json records the hash of every bundle, so a rebuild only rewrites the
+quizzes whose content changed and the months they belong to.
+
+Bundles hold answers and explanations, which RLS only shows to signed-in
+users, so they are uploaded to a private bucket only and the app reads them
+through signed URLs.
+
+    python static_bundles.py                 # incremental rebuild of every quiz in Supabase
+    python static_bundles.py --slug indiabix-2025-08-05
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:  # pragma: no cover - exercised only without brotli installed
+    HAS_BROTLI = False
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATIC_DIR = os.path.join("output", "static")
+# Bumped when the bundle layout changes, which rebuilds everything once
+BUNDLE_VERSION = 3
+BUNDLE_COLUMNS = "slug, title, lang, date_str, quiz_date, source_url, questions(q_index, text, options, answer, explanation, category)"
+# Slugs per `in` filter and rows per page when reading from Supabase
+FETCH_CHUNK = 100
+FETCH_PAGE = 500
+
+# Precompressed variants are JSON too, served with the matching Content-Encoding
+CONTENT_ENCODINGS = {".gz": "gzip", ".br": "br"}
+
+
+def quiz_bundle(row: dict) -> dict:
+    """A quizzes row with its embedded questions, in a stable order."""
+    questions = sorted(row.get("questions") or [], key=lambda q: q["q_index"])
+    return {
+        "v": BUNDLE_VERSION,
+        "slug": row["slug"],
+        "title": row["title"],
+        "lang": row.get("lang") or "gu",
+        "date_str": row.get("date_str"),
+        "quiz_date": str(row["quiz_date"]) if row.get("quiz_date") else None,
+        "source_url": row.get("source_url"),
+        "questions": [
+            {
+                "q_index": q["q_index"],
+                "text": q["text"],
+                "options": q["options"],
+                "answer": q.get("answer"),
+                "explanation": q.get("explanation"),
+                "category": q.get("category"),
+            }
+            for q in questions
+        ],
+    }
+
+
+def encode(document) -> bytes:
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def month_of(quiz_date: Optional[str]) -> str:
+    return quiz_date[:7] if quiz_date else "undated"
+
+
+class StaticPublisher:
+    """
+    Writes quiz bundles and month indexes under a directory, skipping anything unchanged.
+
+    Files are written to a temporary name and renamed into place, and the
+    manifest is saved last, so an interrupted run at worst rewrites some
+    bundles on the next one.
+    """
+
+    def __init__(self, directory: Optional[str] = None, brotli_quality: int = 11):
+        """
+        Args:
+            directory: Output directory, defaults to STATIC_DIR or output/static
+            brotli_quality: Brotli level 0-11 for the .br variants
+        """
+        self.directory = directory or os.getenv("STATIC_DIR", DEFAULT_STATIC_DIR)
+        self.brotli_quality = brotli_quality
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self.manifest = self._load_manifest()
+        self.written_files: List[str] = []
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning(f"{self.manifest_path} is unreadable; rebuilding every bundle")
+            return {}
+        if manifest.get("version") != BUNDLE_VERSION:
+            return {}
+        return manifest.get("quizzes", {})
+
+    def _write_file(self, rel_path: str, data: bytes) -> None:
+        path = os.path.join(self.directory, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.written_files.append(rel_path)
+
+    def _write_document(self, rel_path: str, data: bytes) -> None:
+        """Writes rel_path plus its precompressed .gz and .br variants."""
+        self._write_file(rel_path, data)
+        # mtime=0 keeps the gzip bytes identical for identical content, so CDN ETags stay stable
+        self._write_file(rel_path + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+        if HAS_BROTLI:
+            self._write_file(rel_path + ".br", brotli.compress(data, quality=self.brotli_quality))
+
+    def _variants_exist(self, rel_path: str) -> bool:
+        suffixes = ["", ".gz"] + ([".br"] if HAS_BROTLI else [])
+        return all(os.path.exists(os.path.join(self.directory, rel_path + s)) for s in suffixes)
+
+    def publish(self, rows: Iterable[dict]) -> dict:
+        """
+        Rebuild the bundles of the given quizzes and the indexes of every month they touch.
+
+        Args:
+            rows: quizzes rows with embedded questions, as selected with BUNDLE_COLUMNS
+
+        Returns:
+            Counts of bundles written and unchanged, months reindexed and files written
+        """
+        stats = {"written": 0, "unchanged": 0, "months": 0, "files": 0}
+        touched = set()
+        for row in rows:
+            bundle = quiz_bundle(row)
+            data = encode(bundle)
+            digest = hashlib.sha256(data).hexdigest()[:16]
+            rel_path = f"quiz/{bundle['slug']}.json"
+            previous = self.manifest.get(bundle["slug"])
+            if previous and previous["hash"] == digest and self._variants_exist(rel_path):
+                stats["unchanged"] += 1
+                continue
+
+            self._write_document(rel_path, data)
+            stats["written"] += 1
+            entry = {
+                "hash": digest,
+                "lang": bundle["lang"],
+                "month": month_of(bundle["quiz_date"]),
+                "title": bundle["title"],
+                "date_str": bundle["date_str"],
+                "quiz_date": bundle["quiz_date"],
+                "questions": len(bundle["questions"]),
+            }
+            touched.add((entry["lang"], entry["month"]))
+            if previous:
+                # A quiz whose date or language moved leaves its old month too
+                touched.add((previous["lang"], previous["month"]))
+            self.manifest[bundle["slug"]] = entry
+
+        for lang, month in sorted(touched):
+            self._write_month(lang, month)
+        for lang in sorted({lang for lang, _ in touched}):
+            self._write_months_list(lang)
+        stats["months"] = len(touched)
+
+        if stats["written"]:
+            self._write_file("manifest.json", encode({"version": BUNDLE_VERSION, "quizzes": self.manifest}))
+        stats["files"] = len(self.written_files)
+        return stats
+
+    def _write_month(self, lang: str, month: str) -> None:
+        quizzes = [
+            {
+                "slug": slug,
+                "title": entry["title"],
+                "date_str": entry["date_str"],
+                "quiz_date": entry["quiz_date"],
+                "questions": entry["questions"],
+                "hash": entry["hash"],
+            }
+            for slug, entry in self.manifest.items()
+            if entry["lang"] == lang and entry["month"] == month
+        ]
+        # Newest first, the order the month page lists them in
+        quizzes.sort(key=lambda q: (q["quiz_date"] or "", q["slug"]), reverse=True)
+        self._write_document(f"index/{lang}/{month}.json", encode({"v": BUNDLE_VERSION, "lang": lang, "month": month, "quizzes": quizzes}))
+
+    def _write_months_list(self, lang: str) -> None:
+        counts: Dict[str, int] = {}
+        for entry in self.manifest.values():
+            if entry["lang"] == lang:
+                counts[entry["month"]] = counts.get(entry["month"], 0) + 1
+        months = [{"month": month, "quizzes": counts[month]} for month in sorted(counts, reverse=True)]
+        self._write_document(f"index/{lang}/months.json", encode({"v": BUNDLE_VERSION, "lang": lang, "months": months}))
+
+
+def fetch_quiz_rows(client, slugs: Optional[List[str]] = None, columns: str = BUNDLE_COLUMNS) -> Iterator[dict]:
+    """
+    Read quizzes and their questions from Supabase for bundling.
+
+    Args:
+        client: supabase-py Client
+        slugs: Only these quizzes; every quiz when None
+        columns: Select list, embedded questions included
+    """
+    if slugs is not None:
+        slugs = sorted(set(slugs))
+        for i in range(0, len(slugs), FETCH_CHUNK):
+            res = client.table("quizzes").select(columns).in_("slug", slugs[i:i + FETCH_CHUNK]).execute()
+            yield from res.data
+        return
+    start = 0
+    while True:
+        res = client.table("quizzes").select(columns).order("slug").range(start, start + FETCH_PAGE - 1).execute()
+        yield from res.data
+        if len(res.data) < FETCH_PAGE:
+            return
+        start += FETCH_PAGE
+
+
+def file_options(rel_path: str) -> Dict[str, str]:
+    """Upload options for a bundle file: JSON, with a Content-Encoding for the precompressed variants."""
+    options = {"content-type": "application/json", "cache-control": "60", "upsert": "true"}
+    encoding = CONTENT_ENCODINGS.get(os.path.splitext(rel_path)[1])
+    if encoding:
+        options["content-encoding"] = encoding
+    return options
+
+
+def upload_to_bucket(client, bucket: str, directory: str, rel_paths: List[str]) -> int:
+    """
+    Upload written files to a private Supabase Storage bucket under the same paths.
+
+    Raises:
+        RuntimeError: If the bucket is public, which would hand answers to anyone
+
+    Returns:
+        Number of files uploaded
+    """
+    if client.storage.get_bucket(bucket).public:
+        raise RuntimeError(f"Bucket {bucket} is public; bundles contain answers and only go to a private bucket")
+    storage = client.storage.from_(bucket)
+    uploaded = 0
+    for rel_path in sorted(set(rel_paths)):
+        with open(os.path.join(directory, rel_path), "rb") as f:
+            data = f.read()
+        storage.upload(rel_path, data, file_options(rel_path))
+        uploaded += 1
+    return uploaded
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--slug", action="append", help="only rebuild this quiz (repeatable); default is every quiz")
+    ap.add_argument("--dir", default=None, help="output directory (default: STATIC_DIR or output/static)")
+    ap.add_argument("--bucket", default=os.getenv("STATIC_BUCKET"), help="also upload changed files to this private Supabase Storage bucket")
+    args = ap.parse_args(argv)
+
+    from supabase import create_client
+
+    client = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"])
+    publisher = StaticPublisher(args.dir)
+    stats = publisher.publish(fetch_quiz_rows(client, args.slug))
+    print(f"Static bundles: {stats} in {publisher.directory}")
+    if args.bucket and publisher.written_files:
+        uploaded = upload_to_bucket(client, args.bucket, publisher.directory, publisher.written_files)
+        print(f"Uploaded {uploaded} files to bucket {args.bucket}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -119,3 +119,125 @@ drop trigger if exists on_auth_user_created on auth.users;
 create trigger on_auth_user_created
   after insert on auth.users
   for each row execute procedure public.handle_new_user();
+
+-- 13. One row per question position, required for idempotent upserts
+do $$
+begin
+    if not exists (select 1 from pg_constraint where conname = 'questions_quiz_id_q_index_key') then
+        -- Drop duplicates a half-finished delete+insert may have left behind
+        delete from public.questions a
+            using public.questions b
+            where a.quiz_id = b.quiz_id and a.q_index = b.q_index and a.ctid < b.ctid;
+        alter table public.questions
+            add constraint questions_quiz_id_q_index_key unique (quiz_id, q_index);
+    end if;
+end $$;
+
+-- 14. Content hashes of the English source, used to skip unchanged re-scrapes
+alter table public.quizzes add column if not exists page_hash text;
+alter table public.questions add column if not exists content_hash text;
+
+-- 15. Language of each quiz edition; Gujarati keeps the original slugs,
+-- other languages use indiabix-<date>-<lang>
+alter table public.quizzes add column if not exists lang text not null default 'gu';
+create index if not exists quizzes_lang_date_idx on public.quizzes(lang, quiz_date);
+
+-- 16. Questions that repeat one from an earlier quiz point at the original
+alter table public.questions add column if not exists duplicate_of uuid references public.questions(id) on delete set null;
+create index if not exists questions_duplicate_of_idx on public.questions(duplicate_of);
+
+-- 17. Upsert one or more quizzes with their questions in a single transaction
+-- payload: [{title, slug, lang, date_str, quiz_date, source_url, page_hash, q_indexes,
+--            questions: [{q_index, text, options, answer, explanation, category, content_hash,
+--                         duplicate_of: {slug, q_index} | null}]}]
+-- Only changed questions need to be sent; q_indexes lists every question still on
+-- the page (defaults to the indexes in questions) and the rest are deleted.
+-- duplicate_of names the original question, which must already be stored.
+create or replace function public.upsert_quizzes(payload jsonb)
+returns table (slug text, id uuid, inserted boolean)
+language plpgsql
+security definer
+set search_path = public
+as $$
+#variable_conflict use_column
+declare
+    quiz jsonb;
+    v_id uuid;
+    v_inserted boolean;
+begin
+    for quiz in select value from jsonb_array_elements(payload) loop
+        insert into quizzes (title, slug, lang, date_str, quiz_date, source_url, page_hash)
+        values (
+            quiz->>'title',
+            quiz->>'slug',
+            coalesce(quiz->>'lang', 'gu'),
+            quiz->>'date_str',
+            (quiz->>'quiz_date')::date,
+            quiz->>'source_url',
+            quiz->>'page_hash'
+        )
+        on conflict (slug) do update set
+            title = excluded.title,
+            lang = excluded.lang,
+            date_str = excluded.date_str,
+            quiz_date = excluded.quiz_date,
+            source_url = excluded.source_url,
+            page_hash = excluded.page_hash
+        returning quizzes.id, (xmax = 0) into v_id, v_inserted;
+
+        insert into questions (quiz_id, q_index, text, options, answer, explanation, category, content_hash, duplicate_of)
+        select
+            v_id,
+            (q->>'q_index')::int,
+            q->>'text',
+            q->'options',
+            q->>'answer',
+            q->>'explanation',
+            q->>'category',
+            q->>'content_hash',
+            (select d.id from questions d join quizzes dz on dz.id = d.quiz_id
+             where dz.slug = q->'duplicate_of'->>'slug' and d.q_index = (q->'duplicate_of'->>'q_index')::int)
+        from jsonb_array_elements(quiz->'questions') as q
+        on conflict (quiz_id, q_index) do update set
+            text = excluded.text,
+            options = excluded.options,
+            answer = excluded.answer,
+            explanation = excluded.explanation,
+            category = excluded.category,
+            content_hash = excluded.content_hash,
+            duplicate_of = excluded.duplicate_of;
+
+        -- Questions that disappeared from the page
+        delete from questions
+        where questions.quiz_id = v_id
+          and questions.q_index not in (
+              select value::int from jsonb_array_elements_text(
+                  coalesce(quiz->'q_indexes', jsonb_path_query_array(quiz->'questions', '$[*].q_index'))
+              )
+          );
+
+        slug := quiz->>'slug';
+        id := v_id;
+        inserted := v_inserted;
+        return next;
+    end loop;
+end;
+$$;
+
+-- Only the scraper's service role may call it
+revoke execute on function public.upsert_quizzes(jsonb) from public, anon, authenticated;
+grant execute on function public.upsert_quizzes(jsonb) to service_role;
+
+-- 18. Private bucket for static quiz bundles (static_bundles.py). They include
+-- answers, so like questions only signed-in users may read them, through signed URLs.
+insert into storage.buckets (id, name, public)
+values ('quiz-bundles', 'quiz-bundles', false)
+on conflict (id) do update set public = false;
+
+do $$
+begin
+    if not exists (select 1 from pg_policies where policyname = 'Allow auth read access for quiz bundles') then
+        create policy "Allow auth read access for quiz bundles" on storage.objects
+            for select using (bucket_id = 'quiz-bundles' and auth.role() = 'authenticated');
+    end if;
+end $$;
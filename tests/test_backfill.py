@@ -0,0 +1,46 @@
+"""Backfill shards split a date range deterministically and resume from torn checkpoint files."""
+import datetime
+
+from backfill import DONE, EMPTY, MISSING, ShardCheckpoint, date_range_urls, read_checkpoints, shard_of, shard_urls
+
+URLS = date_range_urls(datetime.date(2024, 12, 28), datetime.date(2025, 1, 6))
+
+
+def test_shards_partition_the_range_with_consecutive_days_on_consecutive_shards():
+    shards = [shard_urls(URLS, i, 3) for i in range(3)]
+
+    assert sorted(u for shard in shards for u in shard) == URLS
+    assert [shard_of(u, 3) for u in URLS[:4]] == [(shard_of(URLS[0], 3) + i) % 3 for i in range(4)]
+    assert shard_of(URLS[0] + "/", 3) == shard_of(URLS[0], 3)
+
+
+def test_torn_lines_are_skipped_and_the_last_status_wins(tmp_path):
+    first = ShardCheckpoint(str(tmp_path), 0, 2)
+    first.record(URLS[0], "failed")
+    first.record(URLS[0], DONE, slugs=["indiabix-2024-12-28"])
+    first.record(URLS[2], MISSING)
+    ShardCheckpoint(str(tmp_path), 1, 2).record(URLS[1], EMPTY)
+    # A shard killed halfway through writing its last line
+    with open(first.path, "a", encoding="utf-8") as f:
+        f.write('{"url": "' + URLS[4] + '", "sta')
+
+    assert read_checkpoints(str(tmp_path)) == {URLS[0]: DONE, URLS[1]: EMPTY, URLS[2]: MISSING}
+
+
+def test_checkpoints_of_a_different_shard_count_are_read_too(tmp_path):
+    ShardCheckpoint(str(tmp_path), 0, 4).record(URLS[0], DONE)
+    ShardCheckpoint(str(tmp_path), 1, 2).record(URLS[1], DONE)
+
+    assert set(read_checkpoints(str(tmp_path))) == {URLS[0], URLS[1]}
+
+
+def test_record_after_a_torn_line_starts_a_new_line(tmp_path):
+    checkpoint = ShardCheckpoint(str(tmp_path), 0, 1)
+    checkpoint.record(URLS[0], DONE)
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"url": "' + URLS[1] + '", "sta')
+
+    # The resumed shard's first record must not be lost to the torn line
+    ShardCheckpoint(str(tmp_path), 0, 1).record(URLS[2], DONE)
+
+    assert read_checkpoints(str(tmp_path)) == {URLS[0]: DONE, URLS[2]: DONE}
@@ -0,0 +1,46 @@
+"""Packed chunks only split back when every part carries its own numbered marker."""
+from batch_translator import BatchTranslator
+
+
+def per_paragraph(render):
+    return lambda chunk: "\n\n".join(render(p) for p in chunk.split("\n\n"))
+
+
+def make_batcher(translate_chunk):
+    return BatchTranslator(translate_chunk=translate_chunk, translate_one=lambda text: f"one:{text}", max_workers=1)
+
+
+def test_clean_chunk_splits_and_strips_markers():
+    batcher = make_batcher(per_paragraph(lambda p: f"[gu] {p}"))
+
+    assert batcher.translate_all(["first", "", "second 2. item", "third"]) == ["[gu] first", "", "[gu] second 2. item", "[gu] third"]
+    assert batcher.requests == 1
+    assert batcher.fallbacks == 0
+
+
+def test_markers_in_target_script_digits_are_accepted():
+    gujarati = str.maketrans("0123456789", "૦૧૨૩૪૫૬૭૮૯")
+    batcher = make_batcher(per_paragraph(lambda p: p.translate(gujarati)))
+
+    assert batcher.translate_all(["a", "b"]) == ["a", "b"]
+    assert batcher.fallbacks == 0
+
+
+def test_reordered_parts_fall_back_to_per_string():
+    batcher = make_batcher(lambda chunk: "\n\n".join(reversed(chunk.split("\n\n"))))
+
+    assert batcher.translate_all(["a", "b", "c"]) == ["one:a", "one:b", "one:c"]
+    assert batcher.fallbacks == 1
+
+
+def test_merged_and_split_parts_fall_back_even_with_the_right_count():
+    # Parts 1 and 2 come back as one paragraph while part 3 is broken in two
+    def shuffle(chunk):
+        first, second, third = chunk.split("\n\n")
+        head, tail = third.split(" ", 1)
+        return f"{first} {second}\n\n{head}\n\n{tail}"
+
+    batcher = make_batcher(shuffle)
+
+    assert batcher.translate_all(["a", "b", "c d"]) == ["one:a", "one:b", "one:c d"]
+    assert batcher.fallbacks == 1
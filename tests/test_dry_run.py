@@ -0,0 +1,41 @@
+"""A dry run through a non-production sink leaves the duplicate index alone."""
+from clients import clients
+import main
+
+
+class Sink:
+    def __init__(self, writes_production):
+        self.writes_production = writes_production
+
+
+class RecordingIndex:
+    def __init__(self):
+        self.added = []
+
+    def add(self, source_url, quiz_date, q_index, content_hash, signature, translations):
+        self.added.append((source_url, q_index, sorted(translations)))
+
+
+def index(writes_production):
+    edition = {
+        "lang": "gu",
+        "source_url": "https://www.indiabix.com/current-affairs/2025-01-01",
+        "quiz_date": "2025-01-01",
+        "questions": [{"q_index": 1, "content_hash": "abc", "signature": [1, 2, 3], "text": "t", "options": {}, "explanation": ""}],
+    }
+    clients.sink = Sink(writes_production)
+    clients.duplicate_index = RecordingIndex()
+    try:
+        main.index_questions([edition], [(True, True)])
+        return clients.duplicate_index.added
+    finally:
+        del clients.sink
+        del clients.duplicate_index
+
+
+def test_production_run_indexes_saved_questions():
+    assert index(True) == [("https://www.indiabix.com/current-affairs/2025-01-01", 1, ["gu"])]
+
+
+def test_dry_run_indexes_nothing():
+    assert index(False) == []
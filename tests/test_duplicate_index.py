@@ -0,0 +1,57 @@
+"""DuplicateIndex only links a question to repeats from strictly earlier quizzes."""
+from content_hash import question_hash
+from duplicate_index import DuplicateIndex, minhash, normalize_question
+
+BASE_URL = "https://www.indiabix.com/current-affairs/"
+
+
+def question(text):
+    q = {"q_index": 1, "text": text, "options": {"A": "Mumbai", "B": "Chennai", "C": "Delhi", "D": "Kolkata"}, "answer": "A", "explanation": ""}
+    q["content_hash"] = question_hash(q)
+    return q
+
+
+ORIGINAL = question("1. Which city hosted the 2025 national fintech summit organised by the RBI?")
+REWORDED = question("4. Which city hosted the 2025 national fintech summit organised by the RBI recently?")
+
+
+def indexed(tmp_path, quiz_date="2025-01-02"):
+    index = DuplicateIndex(str(tmp_path / "duplicates.sqlite"))
+    signature = minhash(normalize_question(ORIGINAL))
+    index.add(BASE_URL + quiz_date, quiz_date, 1, ORIGINAL["content_hash"], signature, {"gu": {"text": "gu text", "options": {}, "explanation": ""}})
+    return index
+
+
+def lookup(index, q, quiz_date):
+    return index.lookup(minhash(normalize_question(q)), q["content_hash"], quiz_date)
+
+
+def test_exact_repeat_from_an_earlier_quiz_reuses_its_translation(tmp_path):
+    index = indexed(tmp_path)
+
+    match = lookup(index, ORIGINAL, "2025-01-05")
+
+    assert match.exact
+    assert match.quiz_date == "2025-01-02"
+    assert index.translation(match.entry_id, "gu")["text"] == "gu text"
+    index.close()
+
+
+def test_near_repeat_from_an_earlier_quiz_is_found(tmp_path):
+    index = indexed(tmp_path)
+
+    match = lookup(index, REWORDED, "2025-01-05")
+
+    assert match is not None and not match.exact
+    assert match.similarity >= index.threshold
+    index.close()
+
+
+def test_same_day_later_and_undated_quizzes_never_match(tmp_path):
+    index = indexed(tmp_path)
+
+    for q in (ORIGINAL, REWORDED):
+        assert lookup(index, q, "2025-01-02") is None
+        assert lookup(index, q, "2025-01-01") is None
+        assert lookup(index, q, None) is None
+    index.close()
@@ -0,0 +1,41 @@
+"""Glossary markers survive reordering by the translator, and a dropped or duplicated marker is caught."""
+from glossary import Glossary
+
+TERMS = {
+    "ISRO": {"gu": "ઇસરો"},
+    "Narendra Modi": {"gu": "નરેન્દ્ર મોદી"},
+    "Chandrayaan": {"gu": "ચંદ્રયાન"},
+}
+
+
+def test_mask_swaps_whole_terms_for_numbered_markers():
+    glossary = Glossary(TERMS)
+
+    masked = glossary.mask("Narendra Modi praised ISRO for Chandrayaan", "gu")
+
+    assert masked == ("[0] praised [1] for [2]", ["નરેન્દ્ર મોદી", "ઇસરો", "ચંદ્રયાન"])
+    assert glossary.mask("ISROs budget", "gu") is None
+    assert glossary.mask("ISRO", "hi") is None
+
+
+def test_restore_puts_renderings_back_where_the_translator_moved_the_markers():
+    glossary = Glossary(TERMS)
+    masked = glossary.mask("Narendra Modi praised ISRO for Chandrayaan", "gu")
+
+    # Gujarati word order moves the markers around, sometimes with spaces inside them
+    restored = glossary.restore("[ 2 ] માટે [1] ની [0] એ પ્રશંસા કરી", masked)
+
+    assert restored == "ચંદ્રયાન માટે ઇસરો ની નરેન્દ્ર મોદી એ પ્રશંસા કરી"
+
+
+def test_dropped_or_duplicated_marker_fails_restore():
+    glossary = Glossary(TERMS)
+    masked = glossary.mask("Narendra Modi praised ISRO", "gu")
+
+    assert glossary.restore("[1] ની પ્રશંસા કરી", masked) is None
+    assert glossary.restore("[0] [0] [1]", masked) is None
+    assert glossary.stats["restore_failures"] == 2
+
+
+def test_text_with_its_own_markers_is_not_masked():
+    assert Glossary(TERMS).mask("ISRO answered question [1]", "gu") is None
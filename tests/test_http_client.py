@@ -0,0 +1,59 @@
+"""HttpFetcher paces retried requests like first attempts and serves 304s from complete cached bodies."""
+import http.server
+import threading
+import time
+
+from http_client import HttpFetcher
+
+
+def serve(responses):
+    """Local server answering GETs with the given (status, headers, body) in turn, recording request times."""
+    seen = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            seen.append((time.monotonic(), self.headers.get("If-None-Match")))
+            status, headers, body = responses[min(len(seen), len(responses)) - 1]
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_port}/quiz", seen
+
+
+def test_retries_wait_for_the_min_interval(tmp_path):
+    httpd, url, seen = serve([(503, {}, b""), (503, {}, b""), (200, {}, b"ok")])
+    fetcher = HttpFetcher(cache_dir=str(tmp_path), backoff=0, min_interval=0.2)
+    try:
+        assert fetcher.get(url).content == b"ok"
+    finally:
+        httpd.shutdown()
+
+    times = [t for t, _ in seen]
+    assert len(times) == 3
+    assert all(later - earlier >= 0.18 for earlier, later in zip(times, times[1:]))
+
+
+def test_not_modified_serves_the_stored_body(tmp_path):
+    httpd, url, seen = serve([(200, {"ETag": '"v1"'}, b"<html>quiz</html>"), (304, {"ETag": '"v1"'}, b"")])
+    fetcher = HttpFetcher(cache_dir=str(tmp_path))
+    try:
+        assert not fetcher.get(url).not_modified
+        second = fetcher.get(url)
+    finally:
+        httpd.shutdown()
+
+    assert second.not_modified
+    assert second.content == b"<html>quiz</html>"
+    assert seen[1][1] == '"v1"'
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
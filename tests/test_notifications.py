@@ -0,0 +1,82 @@
+"""Digests stay within the channel limits, and OneSignal retries are deduplicated."""
+import datetime
+import json as jsonlib
+
+from notifications import TELEGRAM_MAX_MESSAGE_LENGTH, NotificationSender, TelegramSender
+
+
+class RecordingSession:
+    def __init__(self):
+        self.payloads = []
+
+    def post(self, url, json=None, data=None, headers=None, timeout=None):
+        self.payloads.append(json if json is not None else jsonlib.loads(data))
+        return type("Response", (), {"status_code": 200, "text": "ok", "json": lambda self: {"recipients": 1}})()
+
+
+def make_sender():
+    sender = TelegramSender("token", "chat", api_url="http://telegram.invalid")
+    sender.session = RecordingSession()
+    return sender
+
+
+def make_onesignal_sender():
+    sender = NotificationSender("app", "key", api_url="http://onesignal.invalid")
+    sender.session = RecordingSession()
+    return sender
+
+
+def quizzes(count):
+    first = datetime.date(2024, 1, 1)
+    days = [first + datetime.timedelta(days=i) for i in range(count)]
+    return [(d.isoformat(), f"indiabix-{d.isoformat()}") for d in days]
+
+
+def utf16_length(text):
+    return len(text.encode("utf-16-le")) // 2
+
+
+def test_backfill_sized_digest_fits_one_message():
+    sender = make_sender()
+    backlog = quizzes(500)
+
+    assert sender.send_digest_notification(backlog)
+    text = sender.session.payloads[0]["text"]
+    assert utf16_length(text) <= TELEGRAM_MAX_MESSAGE_LENGTH
+    # The newest quiz is linked, the oldest only counted
+    assert backlog[-1][1] in text
+    assert backlog[0][1] not in text
+    assert "અને બીજી" in text
+
+
+def test_small_digest_links_every_quiz():
+    sender = make_sender()
+    few = quizzes(3)
+
+    assert sender.send_digest_notification(few)
+    text = sender.session.payloads[0]["text"]
+    assert all(slug in text for _, slug in few)
+    assert "અને બીજી" not in text
+
+
+def test_onesignal_digest_has_a_stable_idempotency_key():
+    sender = make_onesignal_sender()
+    backlog = quizzes(3)
+
+    assert sender.send_digest_notification(backlog)
+    assert sender.send_digest_notification(list(reversed(backlog)))
+    assert sender.send_digest_notification(backlog[1:])
+    first, replayed, other = (p["idempotency_key"] for p in sender.session.payloads)
+    assert first == replayed
+    assert first != other
+
+
+def test_onesignal_digest_lists_only_the_newest_dates():
+    sender = make_onesignal_sender()
+    backlog = quizzes(500)
+
+    assert sender.send_digest_notification(backlog)
+    message = sender.session.payloads[0]["contents"]["en"]
+    assert backlog[-1][0] in message
+    assert backlog[0][0] not in message
+    assert "અને બીજી 480" in message
@@ -0,0 +1,56 @@
+"""PagePipeline releases pages in input order, whatever order the stages finish them in."""
+import time
+
+from pipeline import PagePipeline
+
+URLS = [f"https://example.test/{i}" for i in range(6)]
+
+
+def run(parse=None, persist=None, admit=None):
+    notified = []
+    finished = []
+    pipeline = PagePipeline(
+        fetch=lambda url: url,
+        # Earlier pages take longer, so they would finish last without reordering
+        parse=parse or (lambda url, content: time.sleep(0.05 * (len(URLS) - int(url[-1]))) or content),
+        translate=lambda page: page,
+        persist=persist or (lambda page: {"saved": page}),
+        notify=lambda url, page, saved: notified.append(url),
+        concurrency={"fetch": 3, "parse": 3, "persist": 2},
+        host_delay=0,
+        admit=admit,
+        on_finished=lambda job: finished.append(job.url),
+    )
+    return pipeline, pipeline.run(URLS), notified, finished
+
+
+def test_pages_are_notified_in_input_order():
+    _, results, notified, finished = run()
+
+    assert notified == URLS
+    assert finished == URLS
+    assert [job.url for job in results] == URLS
+    assert all(job.ok for job in results)
+
+
+def test_skipped_and_failed_pages_keep_their_place_without_notifying():
+    def parse(url, content):
+        return None if url.endswith("/1") else content
+
+    def persist(page):
+        return None if page.endswith("/3") else {"saved": page}
+
+    _, results, notified, finished = run(parse=parse, persist=persist)
+
+    assert finished == URLS
+    assert notified == [URLS[0], URLS[2], URLS[4], URLS[5]]
+    assert results[1].skipped
+    assert results[3].error == "persist failed"
+
+
+def test_refused_url_and_the_rest_are_deferred():
+    pipeline, results, notified, _ = run(admit=lambda url: not url.endswith("/4"))
+
+    assert notified == URLS[:4]
+    assert pipeline.deferred == URLS[4:]
+    assert len(results) == 4
@@ -0,0 +1,67 @@
+"""AdaptiveLimiter backs off on errors, recovers on successes and honours deadlines."""
+import time
+
+import pytest
+
+from rate_limiter import AdaptiveLimiter, RetryBudgetExceeded
+
+
+def test_error_halves_rate_and_concurrency():
+    limiter = AdaptiveLimiter(rate=8.0, concurrency=4)
+
+    assert limiter.acquire()
+    limiter.release(False)
+
+    assert limiter.rate == 4.0
+    assert limiter.concurrency == 2
+    assert limiter.errors == 1
+
+
+def test_successes_raise_rate_and_open_slots_up_to_the_ceiling():
+    limiter = AdaptiveLimiter(rate=100.0, max_rate=101.0, concurrency=1, max_concurrency=2, successes_per_slot=2)
+
+    for _ in range(6):
+        assert limiter.acquire()
+        limiter.release(True)
+
+    assert limiter.rate == 101.0
+    assert limiter.concurrency == 2
+    assert limiter.peak_concurrency == 2
+
+
+def test_acquire_gives_up_at_the_deadline_when_every_slot_is_taken():
+    limiter = AdaptiveLimiter(concurrency=1)
+    assert limiter.acquire()
+
+    started = time.monotonic()
+    assert not limiter.acquire(deadline=started + 0.1)
+    assert time.monotonic() - started < 0.5
+
+
+def test_call_retries_with_backoff_then_succeeds():
+    limiter = AdaptiveLimiter(rate=100.0)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise Exception("429 Too Many Requests")
+        return "ok"
+
+    assert limiter.call(flaky, max_retries=5, base_backoff=0.01) == "ok"
+    assert len(attempts) == 3
+    assert limiter.retries == 2
+    assert limiter.errors == 2
+
+
+def test_call_stops_retrying_at_its_timeout():
+    limiter = AdaptiveLimiter(rate=100.0)
+
+    def always_failing():
+        raise Exception("503")
+
+    started = time.monotonic()
+    with pytest.raises(RetryBudgetExceeded):
+        limiter.call(always_failing, max_retries=10, timeout=0.3, base_backoff=0.1)
+    assert time.monotonic() - started < 1.0
+    assert limiter.give_ups == 1
@@ -0,0 +1,76 @@
+"""DeadlineScheduler admits pages only while they can finish, and CarryOver hands the rest on."""
+import json
+
+from scheduler import CarryOver, DeadlineScheduler, PageTimeEstimator, RunBudget, newest_first
+
+BASE_URL = "https://www.indiabix.com/current-affairs/"
+
+
+def test_without_history_or_budget_every_page_is_admitted():
+    unlimited = DeadlineScheduler(RunBudget(), PageTimeEstimator(latency=1000.0))
+    assert all(unlimited.admit(BASE_URL + str(i)) for i in range(5))
+
+    first_run = DeadlineScheduler(RunBudget(60, margin=0), PageTimeEstimator())
+    assert all(first_run.admit(BASE_URL + str(i)) for i in range(5))
+
+
+def test_pages_that_cannot_finish_before_the_deadline_are_refused():
+    scheduler = DeadlineScheduler(RunBudget(60, margin=10), PageTimeEstimator(latency=20.0, interval=20.0))
+
+    # 50s usable: one page needs 20s, a second in flight 40s, a third 60s
+    assert scheduler.admit("a")
+    assert scheduler.admit("b")
+    assert not scheduler.admit("c")
+
+    scheduler.finished(0.5)
+    assert scheduler.in_flight == 1
+    assert scheduler.estimator.samples == 1
+
+
+def test_budget_margin_and_cap():
+    budget = RunBudget(100, margin=40)
+
+    assert budget.limited
+    assert 59 < budget.remaining() <= 60
+    assert budget.cap(10) == 10
+    assert budget.cap(120) <= 60
+    assert not RunBudget().limited
+
+
+def test_carry_over_keeps_estimates_and_newest_first_order(tmp_path):
+    path = str(tmp_path / "carry_over.json")
+    urls = [BASE_URL + "2025-01-01", BASE_URL + "2025-01-03", BASE_URL + "2025-01-02"]
+    estimator = PageTimeEstimator(latency=12.0, interval=4.0)
+
+    assert CarryOver(path).save(urls, estimator) == []
+
+    loaded, restored = CarryOver(path).load()
+    assert loaded == newest_first(urls)
+    assert (restored.latency, restored.interval) == (12.0, 4.0)
+
+
+def test_url_failing_max_attempts_runs_is_dropped_but_deferred_ones_are_kept(tmp_path):
+    path = str(tmp_path / "carry_over.json")
+    failing, deferred = BASE_URL + "2025-01-01", BASE_URL + "2025-01-02"
+
+    dropped = []
+    for _ in range(3):
+        carry_over = CarryOver(path, max_attempts=3)
+        carry_over.load()
+        dropped = carry_over.save([failing, deferred], PageTimeEstimator(), failed=[failing])
+
+    assert dropped == [failing]
+    with open(path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["urls"] == [deferred]
+    assert saved["attempts"] == {}
+
+
+def test_unreadable_carry_over_starts_fresh(tmp_path):
+    path = tmp_path / "carry_over.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    urls, estimator = CarryOver(str(path)).load()
+
+    assert urls == []
+    assert estimator.latency is None
@@ -0,0 +1,103 @@
+"""Failover, circuit breaking and hedging of TranslationRouter, driven by FakeProvider."""
+import time
+
+import pytest
+
+from translation_backends import FakeProvider, TranslationFailed, TranslationRouter
+
+
+def test_error_fails_over_to_next_provider():
+    primary, backup = FakeProvider("primary"), FakeProvider("backup")
+    primary.fail_next = 1
+    router = TranslationRouter([primary, backup])
+
+    assert router.translate("hello", "en", "gu") == "[gu] hello"
+    assert (primary.errors, backup.strings) == (1, 1)
+    stats = router.stats
+    assert stats["primary"]["errors"] == 1
+    assert stats["backup"]["calls"] == 1
+
+
+def test_every_provider_failing_raises():
+    primary, backup = FakeProvider("primary"), FakeProvider("backup")
+    primary.fail_always = backup.fail_always = True
+    router = TranslationRouter([primary, backup])
+
+    with pytest.raises(TranslationFailed):
+        router.translate("hello")
+
+
+def test_consecutive_errors_take_provider_out_until_cooldown():
+    primary, backup = FakeProvider("primary"), FakeProvider("backup")
+    primary.fail_always = True
+    router = TranslationRouter([primary, backup], failure_threshold=3, cooldown=0.3)
+
+    for _ in range(3):
+        assert router.translate("hello") == "[gu] hello"
+    assert primary.requests == 3
+    assert router.stats["primary"]["available"] is False
+
+    # Out of rotation: the next call goes straight to the backup
+    router.translate("hello")
+    assert primary.requests == 3
+    assert backup.requests == 4
+
+    primary.fail_always = False
+    time.sleep(0.35)
+    assert router.stats["primary"]["available"] is True
+    router.translate("hello")
+    assert primary.requests == 4
+    assert backup.requests == 4
+
+
+def test_slow_call_is_hedged_and_hedge_result_returned():
+    primary, backup = FakeProvider("primary", latency=0.01), FakeProvider("backup")
+    router = TranslationRouter([primary, backup], hedge_min_samples=5, min_hedge_delay=0.05)
+    for _ in range(5):
+        router.translate("warm up")
+    assert backup.requests == 0
+
+    # Far beyond the primary's p95, so the router races the backup against it
+    primary.tail_rate, primary.tail_latency = 1.0, 0.5
+    started = time.monotonic()
+    assert router.translate("hello") == "[gu] hello"
+    assert time.monotonic() - started < 0.4
+    assert backup.strings == 1
+
+    stats = router.stats
+    assert stats["backup"]["hedges"] == 1
+    assert stats["backup"]["hedge_wins"] == 1
+
+
+def test_original_finishing_first_is_not_a_hedge_win():
+    primary, backup = FakeProvider("primary", latency=0.01), FakeProvider("backup", latency=0.5)
+    router = TranslationRouter([primary, backup], hedge_min_samples=5, min_hedge_delay=0.05)
+    for _ in range(5):
+        router.translate("warm up")
+
+    # Slow enough to be hedged, but still back well before the backup
+    primary.tail_rate, primary.tail_latency = 1.0, 0.1
+    assert router.translate("hello") == "[gu] hello"
+
+    stats = router.stats
+    assert stats["backup"]["hedges"] == 1
+    assert stats["primary"]["hedge_wins"] == 0
+    assert stats["backup"]["hedge_wins"] == 0
+
+
+def test_mymemory_quota_notice_is_an_error(monkeypatch):
+    from translation_backends import MyMemoryProvider
+
+    class QuotaTranslator:
+        def __init__(self, **kwargs):
+            pass
+
+        def translate(self, text):
+            return "MYMEMORY WARNING: YOU USED ALL AVAILABLE FREE TRANSLATIONS FOR TODAY."
+
+    deep_translator = pytest.importorskip("deep_translator")
+    monkeypatch.setattr(deep_translator, "MyMemoryTranslator", QuotaTranslator)
+    router = TranslationRouter([MyMemoryProvider()])
+
+    with pytest.raises(TranslationFailed):
+        router.translate("hello")
@@ -0,0 +1,55 @@
+"""mark_unchanged_questions flags exactly the questions whose English source is already stored."""
+from clients import clients
+from content_hash import page_hash, question_hash
+import main
+
+
+class StoredHashes:
+    def __init__(self, stored_page_hash, stored):
+        self.stored = (stored_page_hash, stored)
+
+    def existing_hashes(self, slug):
+        return self.stored
+
+
+def quiz(*texts):
+    questions = []
+    for i, text in enumerate(texts, 1):
+        q = {"q_index": i, "text": text, "options": {"A": "yes", "B": "no"}, "answer": "A", "explanation": "", "category": ""}
+        q["content_hash"] = question_hash(q)
+        questions.append(q)
+    return {"slug": "indiabix-2025-01-01", "questions": questions, "page_hash": page_hash(q["content_hash"] for q in questions)}
+
+
+def mark(quiz_data, stored_page_hash, stored):
+    clients.sink = StoredHashes(stored_page_hash, stored)
+    try:
+        return main.mark_unchanged_questions(quiz_data)
+    finally:
+        del clients.sink
+
+
+def test_new_quiz_has_nothing_unchanged():
+    marked = mark(quiz("first?", "second?"), None, {})
+
+    assert not marked["unchanged"]
+    assert [q["unchanged"] for q in marked["questions"]] == [False, False]
+
+
+def test_edited_question_is_the_only_one_changed():
+    stored = quiz("first?", "second?")
+    edited = quiz("first?", "second, reworded?")
+
+    marked = mark(edited, stored["page_hash"], {q["q_index"]: q["content_hash"] for q in stored["questions"]})
+
+    assert not marked["unchanged"]
+    assert [q["unchanged"] for q in marked["questions"]] == [True, False]
+
+
+def test_identical_page_is_unchanged():
+    stored = quiz("first?", "second?")
+
+    marked = mark(quiz("first?", "second?"), stored["page_hash"], {q["q_index"]: q["content_hash"] for q in stored["questions"]})
+
+    assert marked["unchanged"]
+    assert all(q["unchanged"] for q in marked["questions"])
@@ -0,0 +1,50 @@
+"""The compact processed-URL format round-trips and the legacy list format still loads."""
+import datetime
+import json
+
+from url_store import BASE_URL, GIST_FILE_NAME, ProcessedUrlStore, decode_urls, encode_compact
+
+DATED = [BASE_URL + d for d in ("2024-12-30", "2024-12-31", "2025-01-01", "2025-01-03")]
+OTHER = ["https://www.indiabix.com/current-affairs/questions-and-answers/special"]
+
+
+class GistFile:
+    def __init__(self, content):
+        self.content = content
+
+
+class Gist:
+    def __init__(self, content):
+        self.files = {GIST_FILE_NAME: GistFile(content)}
+
+
+class Github:
+    def __init__(self, content):
+        self.gist = Gist(content)
+
+    def get_gist(self, gist_id):
+        return self.gist
+
+
+def test_compact_form_round_trips_as_runs_of_days():
+    content = encode_compact([datetime.date.fromisoformat(u[-10:]).toordinal() for u in DATED], OTHER)
+
+    assert json.loads(content)["ranges"] == [["2024-12-30", "2025-01-01"], ["2025-01-03", "2025-01-03"]]
+    assert sorted(decode_urls(content)) == sorted(DATED + OTHER)
+
+
+def test_legacy_list_and_empty_content_decode():
+    assert decode_urls(json.dumps(DATED + OTHER + [42])) == DATED + OTHER
+    assert decode_urls("") == []
+
+
+def test_store_loads_a_legacy_gist_and_replays_the_journal(tmp_path):
+    journal = tmp_path / "processed_urls.journal"
+    journal.write_text(BASE_URL + "2025-01-04\n", encoding="utf-8")
+
+    store = ProcessedUrlStore(Github(json.dumps(DATED + OTHER)), "gist", journal_path=str(journal)).load()
+
+    assert len(store) == len(DATED) + len(OTHER) + 1
+    assert BASE_URL + "2025-01-04" in store
+    assert BASE_URL + "2025-01-02" not in store
+    assert OTHER[0] in store
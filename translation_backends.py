@@ -0,0 +1,339 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept per provider for the hedging percentile
+LATENCY_WINDOW = 200
+
+# MyMemory wants locale codes and accepts at most 500 characters per query
+MYMEMORY_CODES = {"en": "en-GB", "gu": "gu-IN", "hi": "hi-IN", "mr": "mr-IN"}
+MYMEMORY_MAX_CHARS = 500
+# Over its quota MyMemory answers 200 with this notice in place of the translation
+MYMEMORY_QUOTA_WARNING = "MYMEMORY WARNING"
+
+
+class TranslationFailed(Exception):
+    """Raised when every provider tried for a text failed."""
+
+
+class TranslationProvider:
+    """A translation backend. Subclasses implement translate() and may be called from many threads."""
+
+    name = "provider"
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        raise NotImplementedError
+
+
+class GoogleProvider(TranslationProvider):
+    """Google Translate through deep_translator."""
+
+    name = "google"
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        from deep_translator import GoogleTranslator
+        return GoogleTranslator(source=source, target=target).translate(text)
+
+
+class MyMemoryProvider(TranslationProvider):
+    """
+    MyMemory through deep_translator.
+
+    MyMemory caps queries at 500 characters, so longer texts are sent paragraph
+    by paragraph and joined back on blank lines, which keeps packed batches splittable.
+    Its quota notice is raised as an error, so it is never cached or published.
+    """
+
+    name = "mymemory"
+
+    def __init__(self, email: Optional[str] = None):
+        """
+        Args:
+            email: Optional contact address, raises MyMemory's daily quota
+        """
+        self.email = email
+
+    def _one(self, text: str, source: str, target: str) -> str:
+        from deep_translator import MyMemoryTranslator
+        translator = MyMemoryTranslator(
+            source=MYMEMORY_CODES.get(source, source),
+            target=MYMEMORY_CODES.get(target, target),
+            email=self.email,
+        )
+        result = translator.translate(text)
+        if result and MYMEMORY_QUOTA_WARNING in result.upper():
+            raise Exception(f"MyMemory quota exceeded: {result[:100]}")
+        return result
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        if len(text) <= MYMEMORY_MAX_CHARS:
+            return self._one(text, source, target)
+        parts = []
+        for paragraph in text.split("\n\n"):
+            if len(paragraph) > MYMEMORY_MAX_CHARS:
+                raise ValueError(f"paragraph of {len(paragraph)} characters is too long for MyMemory")
+            parts.append(self._one(paragraph, source, target) if paragraph.strip() else paragraph)
+        return "\n\n".join(parts)
+
+
+class FakeProvider(TranslationProvider):
+    """
+    Deterministic offline provider for tests and benchmarks.
+
+    Returns "[target] text" for every paragraph after a fixed latency. Slow calls
+    and failures are drawn from a seeded generator, or failures are forced with
+    fail_next / fail_always, so hedging and failover behave the same on every run.
+    """
+
+    def __init__(
+        self,
+        name: str = "fake",
+        latency: float = 0.0,
+        latency_per_char: float = 0.0,
+        error_rate: float = 0.0,
+        tail_rate: float = 0.0,
+        tail_latency: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            name: Provider name used in stats and TRANSLATION_PROVIDERS
+            latency: Seconds per request
+            latency_per_char: Extra seconds per input character
+            error_rate: Probability that a request raises
+            tail_rate: Probability that a request is slow
+            tail_latency: Extra seconds a slow request takes
+            seed: Seed of the failure generator
+        """
+        self.name = name
+        self.latency = latency
+        self.latency_per_char = latency_per_char
+        self.error_rate = error_rate
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.fail_always = False
+        self.fail_next = 0
+        self.requests = 0
+        self.strings = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        with self._lock:
+            self.requests += 1
+            fail = self.fail_always or self.fail_next > 0 or self._rng.random() < self.error_rate
+            if self.fail_next > 0:
+                self.fail_next -= 1
+            slow = self._rng.random() < self.tail_rate
+        time.sleep(self.latency + self.latency_per_char * len(text) + (self.tail_latency if slow else 0.0))
+        if fail:
+            with self._lock:
+                self.errors += 1
+            raise Exception(f"429 Too Many Requests ({self.name})")
+        paragraphs = text.split("\n\n")
+        with self._lock:
+            self.strings += len(paragraphs)
+        return "\n\n".join(f"[{target}] {p}" for p in paragraphs)
+
+
+PROVIDERS = {
+    "google": GoogleProvider,
+    "mymemory": MyMemoryProvider,
+    "fake": FakeProvider,
+}
+
+
+def build_providers(spec: str) -> List[TranslationProvider]:
+    """Instantiates providers from a comma-separated list of names in PROVIDERS, in preference order."""
+    providers = []
+    for name in (spec or "").split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown translation provider: {name} (known: {', '.join(PROVIDERS)})")
+        providers.append(PROVIDERS[name]())
+    return providers
+
+
+class ProviderHealth:
+    """Latency window, error counts and circuit-breaker state of one provider."""
+
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.open_until = 0.0
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100)))]
+
+
+class TranslationRouter:
+    """
+    Sends each text to the preferred healthy provider, hedging and failing over to the next.
+
+    If the first provider has not answered by its own latency percentile, the
+    same text goes to the next provider and whichever succeeds first wins. An
+    error moves on to the next provider straight away, and a provider that
+    fails failure_threshold times in a row is skipped for cooldown seconds.
+    """
+
+    def __init__(
+        self,
+        providers: List[TranslationProvider],
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 20,
+        min_hedge_delay: float = 0.2,
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+        max_workers: int = 32,
+    ):
+        """
+        Args:
+            providers: Providers in order of preference
+            hedge_percentile: Latency percentile of a provider after which a hedge is sent
+            hedge_min_samples: Samples a provider needs before its percentile is trusted
+            min_hedge_delay: Never hedge sooner than this many seconds
+            failure_threshold: Consecutive errors that take a provider out of rotation
+            cooldown: Seconds a failing provider stays out of rotation
+            max_workers: Threads available for in-flight provider calls
+        """
+        if not providers:
+            raise ValueError("TranslationRouter needs at least one provider")
+        self.providers = providers
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.min_hedge_delay = min_hedge_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.health: Dict[str, ProviderHealth] = {p.name: ProviderHealth() for p in providers}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translate")
+        self._lock = threading.Lock()
+
+    def _candidates(self) -> List[TranslationProvider]:
+        now = time.monotonic()
+        with self._lock:
+            healthy = [p for p in self.providers if self.health[p.name].open_until <= now]
+            if healthy:
+                return healthy
+            # Everything is cooling down; try whichever recovers first
+            return sorted(self.providers, key=lambda p: self.health[p.name].open_until)
+
+    def _hedge_delay(self, provider: TranslationProvider) -> Optional[float]:
+        health = self.health[provider.name]
+        with self._lock:
+            if len(health.latencies) < self.hedge_min_samples:
+                return None
+            return max(self.min_hedge_delay, health.percentile(self.hedge_percentile))
+
+    def _call(self, provider: TranslationProvider, text: str, source: str, target: str) -> str:
+        started = time.monotonic()
+        try:
+            result = provider.translate(text, source, target)
+            if not result:
+                raise Exception("Empty translation result")
+        except Exception:
+            with self._lock:
+                health = self.health[provider.name]
+                health.calls += 1
+                health.errors += 1
+                health.consecutive_errors += 1
+                if health.consecutive_errors >= self.failure_threshold:
+                    health.open_until = time.monotonic() + self.cooldown
+                    logger.warning("Translation provider %s failed %d times in a row, skipping it for %ss",
+                                   provider.name, health.consecutive_errors, self.cooldown)
+            raise
+        with self._lock:
+            health = self.health[provider.name]
+            health.calls += 1
+            health.consecutive_errors = 0
+            health.open_until = 0.0
+            health.latencies.append(time.monotonic() - started)
+        return result
+
+    def translate(self, text: str, source: str = "en", target: str = "gu") -> str:
+        """
+        Translate text with the first provider that answers successfully.
+
+        Raises:
+            TranslationFailed: If every candidate provider failed
+        """
+        queue = self._candidates()
+        pending = {}
+        errors = []
+        hedge = None
+
+        def launch():
+            provider = queue.pop(0)
+            future = self._executor.submit(self._call, provider, text, source, target)
+            pending[future] = (provider, time.monotonic())
+            return future
+
+        launch()
+        while pending:
+            timeout = None
+            if hedge is None and queue and len(pending) == 1:
+                provider, started = next(iter(pending.values()))
+                delay = self._hedge_delay(provider)
+                if delay is not None:
+                    timeout = max(0.0, started + delay - time.monotonic())
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # The current provider is slower than usual, race it against the next one
+                with self._lock:
+                    self.health[queue[0].name].hedges += 1
+                hedge = launch()
+                continue
+
+            for future in done:
+                provider, _ = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(f"{provider.name}: {e}")
+                    continue
+                # Only the backup answering first is a win; the original answering first is not
+                if future is hedge:
+                    with self._lock:
+                        self.health[provider.name].hedge_wins += 1
+                return result
+
+            # Fail over as soon as nothing is left in flight
+            if not pending and queue:
+                launch()
+
+        raise TranslationFailed("; ".join(errors))
+
+    @property
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            out = {}
+            for name, health in self.health.items():
+                p50, p95 = health.percentile(50), health.percentile(95)
+                out[name] = {
+                    "calls": health.calls,
+                    "errors": health.errors,
+                    "error_rate": round(health.errors / health.calls, 3) if health.calls else 0.0,
+                    "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                    "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                    "hedges": health.hedges,
+                    "hedge_wins": health.hedge_wins,
+                    "available": health.open_until <= now,
+                }
+            return out
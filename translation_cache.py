@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "translations.sqlite")
+DEFAULT_MAX_ENTRIES = 200000
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapses runs of whitespace so trivially different copies share a cache entry."""
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def cache_key(text: str, source: str, target: str) -> str:
+    """Returns the content address for a (normalized text, language pair) tuple."""
+    payload = f"{source}\x1f{target}\x1f{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """Persistent, size-bounded LRU cache of translations backed by SQLite."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file location, defaults to TRANSLATION_CACHE_PATH or .cache/translations.sqlite
+            max_entries: Upper bound on stored translations before LRU eviction kicks in
+        """
+        self.path = path or os.getenv("TRANSLATION_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries or int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # A single shared connection guarded by a lock is enough for the handful of
+        # translator threads we run; SQLite serialises writers anyway.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY,"
+            " source TEXT NOT NULL,"
+            " target TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS translations_last_used_idx ON translations(last_used)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def get(self, text: str, source: str, target: str) -> Optional[str]:
+        """
+        Look up a cached translation and refresh its recency.
+
+        Returns:
+            The cached translation, or None on a miss
+        """
+        key = cache_key(text, source, target)
+        with self._lock:
+            row = self._conn.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE translations SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, text: str, source: str, target: str, translation: str) -> None:
+        """Store a translation, evicting the least recently used entries if the cache is full."""
+        if not translation:
+            return
+        key = cache_key(text, source, target)
+        with self._lock:
+            existed = self._conn.execute("SELECT 1 FROM translations WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, source, target, translation, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, source, target, translation, time.time()),
+            )
+            if not existed:
+                self._size += 1
+            if self._size > self.max_entries:
+                overflow = self._size - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM translations WHERE key IN"
+                    " (SELECT key FROM translations ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._size -= overflow
+                self.evictions += overflow
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self._size,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Folds the write-ahead log into the database file and closes it, so the .sqlite file alone is complete."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
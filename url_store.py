@@ -0,0 +1,201 @@
+import datetime
+import json
+import logging
+import os
+import re
+import threading
+from typing import Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+GIST_FILE_NAME = "scraped_urls.json"
+STORE_FORMAT = "indiabix-dates/v1"
+BASE_URL = "https://www.indiabix.com/current-affairs/"
+DEFAULT_JOURNAL_PATH = os.path.join(".cache", "processed_urls.journal")
+
+_DATE_URL_RE = re.compile(r"^https://www\.indiabix\.com/current-affairs/(\d{4}-\d{2}-\d{2})$")
+
+
+def _date_ordinal(url: str) -> Optional[int]:
+    match = _DATE_URL_RE.match(url)
+    if not match:
+        return None
+    try:
+        return datetime.date.fromisoformat(match.group(1)).toordinal()
+    except ValueError:
+        return None
+
+
+def _ordinal_url(ordinal: int) -> str:
+    return BASE_URL + datetime.date.fromordinal(ordinal).isoformat()
+
+
+def encode_compact(ordinals: Iterable[int], other: Iterable[str]) -> str:
+    """Serializes processed dates as sorted runs of consecutive days."""
+    ranges = []
+    for ordinal in sorted(set(ordinals)):
+        if ranges and ranges[-1][1] == ordinal - 1:
+            ranges[-1][1] = ordinal
+        else:
+            ranges.append([ordinal, ordinal])
+    return json.dumps({
+        "format": STORE_FORMAT,
+        "base": BASE_URL,
+        "ranges": [
+            [datetime.date.fromordinal(a).isoformat(), datetime.date.fromordinal(b).isoformat()]
+            for a, b in ranges
+        ],
+        "other": sorted(set(other)),
+    }, separators=(",", ":"))
+
+
+def decode_urls(content: str) -> List[str]:
+    """Reads either the legacy JSON list of URLs or the compact date-range form."""
+    data = json.loads(content) if content and content.strip() else []
+    if isinstance(data, list):
+        return [u for u in data if isinstance(u, str)]
+
+    urls = list(data.get("other", []))
+    base = data.get("base", BASE_URL)
+    for start, end in data.get("ranges", []):
+        first = datetime.date.fromisoformat(start).toordinal()
+        last = datetime.date.fromisoformat(end).toordinal()
+        urls.extend(base + datetime.date.fromordinal(o).isoformat() for o in range(first, last + 1))
+    return urls
+
+
+class ProcessedUrlStore:
+    """
+    Set of processed quiz URLs backed by a GitHub Gist.
+
+    Dated quiz URLs are indexed by day, so membership is O(1) and the Gist file
+    is a short list of date ranges. Additions go to a local append-only journal
+    right away and reach the Gist in a single write when sync() is called.
+    """
+
+    def __init__(self, gh, gist_id: str, journal_path: Optional[str] = None):
+        """
+        Args:
+            gh: Authenticated PyGithub client
+            gist_id: ID of the Gist holding scraped_urls.json
+            journal_path: Local journal of unsynced additions, defaults to .cache/processed_urls.journal
+        """
+        self.gh = gh
+        self.gist_id = gist_id
+        self.journal_path = journal_path or os.getenv("PROCESSED_URLS_JOURNAL", DEFAULT_JOURNAL_PATH)
+        self.gist_files: List[str] = []
+        self._days = set()
+        self._other = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _add_local(self, url: str) -> bool:
+        ordinal = _date_ordinal(url)
+        if ordinal is not None:
+            if ordinal in self._days:
+                return False
+            self._days.add(ordinal)
+        else:
+            if url in self._other:
+                return False
+            self._other.add(url)
+        return True
+
+    def _read_gist(self):
+        gist = self.gh.get_gist(self.gist_id)
+        self.gist_files = list(gist.files.keys())
+        if GIST_FILE_NAME in gist.files:
+            return gist, decode_urls(gist.files[GIST_FILE_NAME].content)
+        return gist, []
+
+    def load(self) -> "ProcessedUrlStore":
+        """Loads the Gist and replays any journal entries a previous run did not sync."""
+        try:
+            _, urls = self._read_gist()
+            for url in urls:
+                self._add_local(url)
+        except Exception as e:
+            print(f"Error fetching Gist: {e}")
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                pending = [line.strip() for line in f if line.strip()]
+            for url in pending:
+                if self._add_local(url):
+                    self._dirty = True
+            if pending:
+                print(f"Replayed {len(pending)} journaled URLs from a previous run.")
+        return self
+
+    def __contains__(self, url: str) -> bool:
+        ordinal = _date_ordinal(url)
+        if ordinal is not None:
+            return ordinal in self._days
+        return url in self._other
+
+    def __len__(self) -> int:
+        return len(self._days) + len(self._other)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.urls())
+
+    def urls(self) -> List[str]:
+        return sorted(_ordinal_url(o) for o in self._days) + sorted(self._other)
+
+    def add(self, url: str) -> None:
+        """Marks a URL processed and journals it locally; the Gist is written on sync()."""
+        self.add_many([url])
+
+    def add_many(self, urls: Iterable[str]) -> None:
+        with self._lock:
+            added = [u for u in urls if self._add_local(u)]
+            if not added:
+                return
+            directory = os.path.dirname(self.journal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write("".join(u + "\n" for u in added))
+                f.flush()
+                os.fsync(f.fileno())
+            self._dirty = True
+
+    def sync(self, description: Optional[str] = None, extra_files: Optional[dict] = None) -> bool:
+        """
+        Write the store to the Gist in one edit if anything changed since the last sync.
+
+        The Gist is re-read first and merged, so concurrent writers never drop each other's URLs.
+
+        Args:
+            description: Optional new Gist description
+            extra_files: Optional {file name: content} written alongside scraped_urls.json
+
+        Returns:
+            True if the Gist is up to date afterwards
+        """
+        with self._lock:
+            if not self._dirty and not extra_files and description is None:
+                return True
+            # Only writers need PyGithub's payload type; readers import nothing from it
+            from github.InputFileContent import InputFileContent
+
+            try:
+                gist, remote = self._read_gist()
+                for url in remote:
+                    self._add_local(url)
+                files = {GIST_FILE_NAME: InputFileContent(encode_compact(self._days, self._other))}
+                for name, content in (extra_files or {}).items():
+                    files[name] = InputFileContent(content)
+                if description is not None:
+                    gist.edit(description=description, files=files)
+                else:
+                    gist.edit(files=files)
+            except Exception as e:
+                print(f"Error updating Gist: {e}")
+                return False
+
+            self._dirty = False
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            print(f"Gist updated successfully ({len(self)} processed URLs).")
+            return True